@@ -0,0 +1,81 @@
+"""
+Benchmark of the async mode of `ActorScraperEngine.run_scraping`.
+
+Serves a fake Wikipedia actor page from a local HTTP server that waits
+`LATENCY` seconds before each response, and scrapes synthetic actors with an
+increasing concurrency. The rate limit is raised so that the throughput
+only depends on the concurrency, then the default politeness rate is shown
+to cap it. Checks that every actor gets the data of the page. Run from the
+repository root:
+
+    python -m benchmarks.bench_async_scraping
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from src.engines.webscraping import ASYNC_RATE, ActorScraperEngine
+
+LATENCY = 0.2
+
+PAGE = b"""<html><body><div class="mw-parser-output">
+<table class="infobox"><tbody>
+<tr><th>Born</th><td><span class="bday">1970-01-01</span><div class="birthplace">Lausanne, Switzerland</div></td></tr>
+<tr><th>Alma mater</th><td>University of Geneva</td></tr>
+<tr><th>Children</th><td>2</td></tr>
+</tbody></table>
+<p>Jane Doe is a Swiss actress who studied theatre and played tennis.</p>
+</div></body></html>"""
+
+
+class FakeWikipediaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def scrape(engine, n_actors, concurrency, rate):
+    """
+    Scrapes synthetic actors and returns the completed frame and the wall-clock time.
+    """
+    actor_df = pd.DataFrame(index=[f'actor {i}' for i in range(n_actors)])
+    start = time.perf_counter()
+    engine.run_scraping(actor_df, concurrency=concurrency, rate=rate)
+    return actor_df, time.perf_counter() - start
+
+
+def main(n_actors=200):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeWikipediaHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    engine = ActorScraperEngine()
+    engine.base_url = f'http://127.0.0.1:{server.server_address[1]}/wiki/'
+    print(f'{n_actors} actors, {LATENCY * 1000:.0f} ms per page')
+
+    try:
+        for concurrency in [1, 4, 16, 64]:
+            actor_df, elapsed = scrape(engine, n_actors, concurrency, rate=1000)
+            assert (actor_df['University'] == 'University of Geneva').all(), 'pages not parsed'
+            assert (actor_df['Birth City'] == 'Lausanne Switzerland').all(), 'pages not parsed'
+            print(f'concurrency {concurrency:3d}: {n_actors / elapsed:6.1f} pages/s')
+
+        actor_df, elapsed = scrape(engine, 10, 16, rate=ASYNC_RATE)
+        print(f'concurrency  16 at the default rate of {ASYNC_RATE} req/s: {10 / elapsed:6.2f} pages/s')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Load test of the prediction server.
+
+Starts a `PredictionServer` on a free local port and sends single-actor
+requests from concurrent clients over keep-alive connections, with and
+without micro-batching. Checks that the predictions equal those of
+`predict_success` and prints the client latencies and the server counters.
+Trains and saves the regression first if no model was saved. Run from the
+repository root:
+
+    python -m benchmarks.bench_prediction_server
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data import load_actor_data_for_analysis
+from src.models.linear_regression import MODEL_PATH, TARGET_COLUMN, predict_success, regression_rows, train_linear_regression
+from src.models.prediction_server import PredictionServer
+
+
+def sample_actors(n_actors=2000, seed=0):
+    """
+    Returns actor records drawn with replacement from the actor data, missing values as None.
+    """
+    rows = regression_rows(load_actor_data_for_analysis()).drop(columns=TARGET_COLUMN)
+    rows = rows.sample(n_actors, replace=True, random_state=seed).astype(object)
+    return rows.where(rows.notna(), None).to_dict('records')
+
+
+def run_clients(port, actors, n_clients):
+    """
+    Sends one request per actor, split between `n_clients` threads.
+
+    Returns:
+        np.ndarray: The prediction of each actor.
+        np.ndarray: The latency of each request in seconds.
+        float: The total wall-clock time.
+    """
+    predictions = np.empty(len(actors))
+    latencies = np.empty(len(actors))
+
+    def client(indices):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        for i in indices:
+            body = json.dumps(actors[i])
+            start = time.perf_counter()
+            connection.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+            response = json.loads(connection.getresponse().read())
+            latencies[i] = time.perf_counter() - start
+            predictions[i] = response['predictions'][0]
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(indices,))
+               for indices in np.array_split(np.arange(len(actors)), n_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return predictions, latencies, time.perf_counter() - start
+
+
+def main(n_actors=2000, n_clients=16):
+    if not os.path.exists(MODEL_PATH):
+        train_linear_regression()
+
+    actors = sample_actors(n_actors)
+    expected = predict_success(None, pd.DataFrame.from_records(actors))
+    print(f'{n_actors} single-actor requests from {n_clients} clients')
+
+    for label, max_batch_size, max_wait in [('no batching', 1, 0.0), ('micro-batches', 1024, 0.002)]:
+        server = PredictionServer(('127.0.0.1', 0), MODEL_PATH, max_batch_size, max_wait)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            predictions, latencies, elapsed = run_clients(server.server_address[1], actors, n_clients)
+            stats = server.stats.snapshot()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert np.allclose(predictions, expected, rtol=0, atol=1e-9), 'predictions differ'
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f'{label:14s} {n_actors / elapsed:7.0f} req/s  p50 {p50:5.1f} ms  p99 {p99:5.1f} ms  '
+              f'mean batch {stats["mean_batch_size"]:.1f} requests')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark of the release date parsing of the CMU movie metadata.
+
+Compares the per-row `convert_to_datetime` with the batched
+`convert_release_dates` on the full 81k-movie file and on a 10x replicated
+version of it. Run from the repository root:
+
+    python -m benchmarks.bench_release_dates
+"""
+
+import time
+
+import pandas as pd
+
+from src.data.data_loader import MOVIE_METADATA_PATH, convert_release_dates, convert_to_datetime
+
+
+def time_call(func, *args, repeat=3):
+    """
+    Returns the best wall-clock time of `repeat` calls and the last result.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    dates = pd.read_csv(MOVIE_METADATA_PATH, sep='\t', header=None, usecols=[3]).iloc[:, 0]
+
+    for label, series in [('full file', dates),
+                          ('10x replicated', pd.concat([dates] * 10, ignore_index=True))]:
+        per_row_time, per_row = time_call(lambda s: s.apply(convert_to_datetime), series, repeat=1)
+        batched_time, batched = time_call(convert_release_dates, series)
+        pd.testing.assert_series_equal(per_row, batched)
+
+        print(f'{label} ({len(series)} rows, {series.nunique()} distinct values)')
+        print(f'  per-row apply: {per_row_time:.3f} s')
+        print(f'  batched:       {batched_time:.3f} s ({per_row_time / batched_time:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
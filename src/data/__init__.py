@@ -1,4 +1,8 @@
 from .actor_data_completion import scrape_actor_data, clean_actor_data
-from .transform_data import raw_data, clean_data, actor_data
+from .transform_data import raw_data, clean_data, actor_data, movie_attributes
 from .data_loader import load_actor_data_for_analysis
-from .correlation import display_correlation
+from .correlation import display_correlation, target_correlation, target_association, TargetCorrelation
+from .column_store import NumericColumnStore
+from .join_keys import title_keys
+from .backend import set_backend, get_backend
+from .encoding import CategoricalEncoder
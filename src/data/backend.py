@@ -0,0 +1,44 @@
+from importlib.metadata import version
+from importlib.util import find_spec
+
+BACKENDS = ('pandas', 'polars')
+
+# Oldest polars with the join options of the polars backend
+POLARS_MIN_VERSION = (1, 24)
+
+_backend = 'pandas'
+
+
+def set_backend(name):
+    """
+    Selects the DataFrame backend used by the loaders and transforms of `src.data`.
+
+    With the 'polars' backend, `load_*`, `merge_data`, `raw_data`, `clean_data`
+    and `actor_data` run as Polars lazy queries and only convert the result to
+    pandas at the end. The functions keep the same names and return pandas
+    DataFrames with either backend.
+
+    Args:
+        name (str): 'pandas' (default) or 'polars'.
+    """
+
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of {BACKENDS}.")
+    if name == 'polars' and find_spec('polars') is None:
+        raise ImportError("The 'polars' backend requires polars (pip install polars).")
+    if name == 'polars' and tuple(int(part) for part in version('polars').split('.')[:2]) < POLARS_MIN_VERSION:
+        raise ImportError(f"The 'polars' backend requires polars>={'.'.join(map(str, POLARS_MIN_VERSION))}, "
+                          f"found {version('polars')}.")
+    _backend = name
+
+
+def get_backend():
+    """
+    Returns the name of the selected DataFrame backend.
+    """
+    return _backend
+
+
+def use_polars():
+    return _backend == 'polars'
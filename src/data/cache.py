@@ -0,0 +1,84 @@
+import hashlib
+import os
+from importlib.util import find_spec
+
+import pandas as pd
+
+CACHE_DIR = 'data/cache'
+
+# Bump when the normalization done by the loaders changes, to invalidate existing caches
+CACHE_VERSION = 2
+
+
+def cache_path(source_path, tag):
+    """
+    Builds the Parquet cache path of a source file.
+
+    The key is derived from the absolute path, the size and the modification
+    time of the source file, so any change to the file invalidates its cache.
+    Changing `CACHE_VERSION` invalidates all caches.
+
+    Args:
+        source_path (str): Path to the raw CSV/TSV file.
+        tag (str): Name of the loader owning the cache entry.
+
+    Returns:
+        str: Path of the Parquet file holding the cached frame.
+    """
+
+    stat = os.stat(source_path)
+    key = f'{CACHE_VERSION}|{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}'
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f'{tag}-{digest}.parquet')
+
+
+def cached_frame(source_path, parse, tag, columns=None):
+    """
+    Loads a normalized frame from the Parquet cache, parsing the source file on a miss.
+
+    On a warm run only the requested columns are read from the columnar file
+    and the CSV/TSV source is never parsed. If pyarrow is not installed the
+    cache is bypassed and `parse` is called directly.
+
+    Args:
+        source_path (str): Path to the raw CSV/TSV file.
+        parse (callable): Function returning the normalized DataFrame for the source file.
+        tag (str): Name of the loader owning the cache entry.
+        columns (list, optional): Subset of columns to load. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: The normalized DataFrame.
+    """
+
+    if find_spec('pyarrow') is None:
+        df = parse()
+        return df if columns is None else df[columns]
+
+    path = cache_path(source_path, tag)
+    if os.path.exists(path):
+        return pd.read_parquet(path, columns=columns)
+
+    df = parse()
+    write_cache(df, path, tag)
+    return df if columns is None else df[columns]
+
+
+def write_cache(df, path, tag):
+    """
+    Writes a frame to the cache and removes stale entries of the same loader.
+
+    Frames that cannot be represented in Parquet (e.g. mixed-type object
+    columns) are simply not cached.
+    """
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(f'{tag}-') and name.endswith('.parquet'):
+            os.remove(os.path.join(CACHE_DIR, name))
+
+    try:
+        df.to_parquet(path, index=False)
+    except Exception as e:
+        print(f"Could not cache {tag}: {e}")
+        if os.path.exists(path):
+            os.remove(path)
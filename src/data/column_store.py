@@ -0,0 +1,173 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Numeric movie columns used to compute the movie and actor success indices
+MOVIE_NUMERIC_COLUMNS = ['Movie box office revenue', 'Movie budget', 'Review score', 'Movie votes',
+                         'Number of nomination', 'Movie release date']
+
+# Integer movie id of the CMU dataset
+MOVIE_ID_COLUMN = 'Wikipedia movie ID'
+
+ALIGNMENT = 64
+
+
+class NumericColumnStore:
+    """
+    Read-only store of numeric columns, written once as contiguous typed arrays
+    in a single memory-mapped file and keyed by integer ids.
+
+    Opening the store in several processes maps the same file, so every reader
+    gets zero-copy NumPy views instead of its own copy of the data. Pickling a
+    store only pickles its path, which makes it cheap to send to worker processes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self._arrays = {}
+
+    @classmethod
+    def write(cls, path, df, columns, ids=None):
+        """
+        Writes numeric columns of a DataFrame to a new store.
+
+        Rows are stored sorted by id. Integer columns with missing values are
+        stored as float64 with NaN.
+
+        Args:
+            path (str): Directory of the store, created if needed.
+            df (pd.DataFrame): DataFrame holding the columns.
+            columns (list): Names of the numeric columns to store.
+            ids (array-like, optional): Unique integer id of each row. Defaults to the index of `df`.
+
+        Returns:
+            NumericColumnStore: The store opened for reading.
+        """
+
+        ids = np.asarray(df.index if ids is None else ids)
+        if not np.issubdtype(ids.dtype, np.integer):
+            raise TypeError("Ids of a NumericColumnStore must be integers")
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        if len(ids) > 1 and (ids[1:] == ids[:-1]).any():
+            raise ValueError("Ids of a NumericColumnStore must be unique")
+
+        arrays = {'__ids__': ids}
+        for col in columns:
+            values = df[col]
+            if values.hasnans or not (pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)):
+                values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = values.to_numpy()
+            arrays[col] = values[order]
+
+        # Lay the arrays out back to back, each one aligned for fast access
+        layout = {}
+        offset = 0
+        for name, values in arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout[name] = {'dtype': values.dtype.str, 'offset': offset}
+            offset += values.nbytes
+
+        os.makedirs(path, exist_ok=True)
+        data = np.memmap(os.path.join(path, 'columns.bin'), dtype=np.uint8, mode='w+', shape=(max(offset, 1),))
+        for name, values in arrays.items():
+            start = layout[name]['offset']
+            data[start:start + values.nbytes] = np.ascontiguousarray(values).view(np.uint8)
+        data.flush()
+        del data
+
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'length': len(ids), 'columns': list(columns), 'layout': layout}, f)
+
+        return cls(path)
+
+    @classmethod
+    def write_movies(cls, path, movies, columns=MOVIE_NUMERIC_COLUMNS):
+        """
+        Writes the numeric movie columns used by the success indices to a new store.
+
+        The movies are keyed by their 'Wikipedia movie ID' if the DataFrame has
+        it, else by its integer index. The columns missing from `movies` are skipped.
+
+        Args:
+            path (str): Directory of the store, created if needed.
+            movies (pd.DataFrame): Movie data, e.g. returned by `clean_data`.
+            columns (list, optional): Numeric columns to store. Defaults to `MOVIE_NUMERIC_COLUMNS`.
+
+        Returns:
+            NumericColumnStore: The store opened for reading.
+        """
+        ids = movies[MOVIE_ID_COLUMN] if MOVIE_ID_COLUMN in movies.columns else None
+        return cls.write(path, movies, [column for column in columns if column in movies.columns], ids)
+
+    @property
+    def columns(self):
+        return self.meta['columns']
+
+    @property
+    def ids(self):
+        """
+        Sorted integer ids of the stored rows.
+        """
+        return self._array('__ids__')
+
+    def _array(self, name):
+        if name not in self._arrays:
+            if name not in self.meta['layout']:
+                raise KeyError(f"Column '{name}' not found in the store.")
+            layout = self.meta['layout'][name]
+            self._arrays[name] = np.memmap(os.path.join(self.path, 'columns.bin'), dtype=np.dtype(layout['dtype']),
+                                           mode='r', offset=layout['offset'], shape=(self.meta['length'],))
+        return self._arrays[name]
+
+    def column(self, name):
+        """
+        Returns a zero-copy, read-only view of a whole column, ordered like `ids`.
+        """
+        return self._array(name)
+
+    def positions(self, ids):
+        """
+        Returns the row positions of the given ids.
+
+        Raises:
+            KeyError: If an id is not in the store.
+        """
+        ids = np.asarray(ids)
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == ids[found]
+        if not found.all():
+            raise KeyError(f"Ids not found in the store: {ids[~found][:5].tolist()}")
+        return positions
+
+    def get(self, name, ids):
+        """
+        Returns the values of a column for the given ids.
+        """
+        return self.column(name)[self.positions(ids)]
+
+    def slice(self, name, start_id, stop_id):
+        """
+        Returns a zero-copy view of a column for the ids in [start_id, stop_id).
+        """
+        start, stop = np.searchsorted(self.ids, [start_id, stop_id])
+        return self.column(name)[start:stop]
+
+    def to_frame(self, columns=None):
+        """
+        Returns the stored columns as a DataFrame indexed by id.
+        """
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.column(col) for col in columns}, index=pd.Index(self.ids, name='id'))
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
@@ -3,31 +3,233 @@ import seaborn as sns
 import pandas as pd
 import numpy as np
 from src.constants import ETHNICITY_MAPPING
+from .encoding import CategoricalEncoder
 
 def encode_categorical(df, columns):
     """
     Encodes categorical features in the given DataFrame using one-hot encoding.
+    The boolean columns are those of `pd.get_dummies`, appended after the other columns,
+    stored as sparse columns.
     """
-    return pd.get_dummies(df, columns=columns)
+    encoder = CategoricalEncoder(columns)
+    one_hot = pd.DataFrame.sparse.from_spmatrix(encoder.fit_transform(df), index=df.index, columns=encoder.feature_names)
+    return pd.concat([df.drop(columns=columns), one_hot.astype(pd.SparseDtype(bool, False))], axis=1)
+
+class TargetCorrelation:
+    """
+    Pearson correlation of numeric features with a target, updated from chunks of rows.
+
+    Keeps, for each feature, the number of rows where both the feature and the
+    target are present, their means, the sums of squared deviations and the
+    co-moment. Each chunk is reduced to the same statistics, which are merged
+    with the running ones (Chan et al.'s update of Welford's algorithm), so the
+    rows are never held together and the result does not drift with the
+    number of chunks. Missing values are excluded pairwise, like `DataFrame.corr`.
+    """
+
+    def __init__(self, target='Success Score'):
+        self.target = target
+        self.features = None
+        self.count = None
+        self.mean_x = None
+        self.mean_y = None
+        self.m2_x = None
+        self.m2_y = None
+        self.comoment = None
+
+    def update(self, df):
+        """
+        Adds a chunk of rows. The features are the numeric columns of the first chunk.
+
+        Returns:
+            TargetCorrelation: The accumulator.
+        """
+        if self.features is None:
+            self.features = [column for column in df.select_dtypes(include=[np.number]).columns if column != self.target]
+            self.count, self.mean_x, self.mean_y, self.m2_x, self.m2_y, self.comoment = np.zeros((6, len(self.features)))
+
+        X = df.reindex(columns=self.features).to_numpy(dtype=np.float64, na_value=np.nan)
+        y = df[self.target].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._merge(*chunk_moments(X, y))
+        return self
+
+    def correlation(self):
+        """
+        Returns:
+            pd.Series: The correlation of each feature with the target, NaN for
+                features with less than 2 rows or a constant value.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.sqrt(self.m2_x * self.m2_y)
+        corr[(self.count < 2) | (self.m2_x == 0) | (self.m2_y == 0)] = np.nan
+        return pd.Series(np.clip(corr, -1, 1), index=self.features, name=self.target)
+
+    def _merge(self, count, mean_x, mean_y, m2_x, m2_y, comoment):
+        total = self.count + count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, count / total, 0)
+        delta_x = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+
+        self.m2_x += m2_x + delta_x ** 2 * self.count * weight
+        self.m2_y += m2_y + delta_y ** 2 * self.count * weight
+        self.comoment += comoment + delta_x * delta_y * self.count * weight
+        self.mean_x += delta_x * weight
+        self.mean_y += delta_y * weight
+        self.count = total
+
+
+def chunk_moments(X, y):
+    """
+    Computes the count, means, sums of squared deviations and co-moment of each
+    column of X with y over the rows where both are present.
+
+    When no value is missing, the co-moments are a single matrix-vector product
+    of the centered columns with the centered target.
+    """
+    present = ~np.isnan(X) & ~np.isnan(y)[:, None]
+    if present.all():
+        count = np.full(X.shape[1], len(y), dtype=np.float64)
+        centered_x = X - X.mean(axis=0)
+        centered_y = y - y.mean()
+        return (count, X.mean(axis=0), np.full(X.shape[1], y.mean()), (centered_x ** 2).sum(axis=0),
+                np.full(X.shape[1], centered_y @ centered_y), centered_x.T @ centered_y)
+
+    count = present.sum(axis=0).astype(np.float64)
+    X = np.where(present, X, 0)
+    y = np.where(present, np.nan_to_num(y)[:, None], 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.where(count > 0, X.sum(axis=0) / count, 0)
+        mean_y = np.where(count > 0, y.sum(axis=0) / count, 0)
+    centered_x = np.where(present, X - mean_x, 0)
+    centered_y = np.where(present, y - mean_y, 0)
+    return (count, mean_x, mean_y, (centered_x ** 2).sum(axis=0), (centered_y ** 2).sum(axis=0),
+            (centered_x * centered_y).sum(axis=0))
+
+
+def target_correlation(data, target='Success Score'):
+    """
+    Calculates the correlation of the numeric columns with the target, without the full correlation matrix.
+
+    Args:
+        data (pd.DataFrame or iterable): The rows, or chunks of rows (e.g.
+            `load_actor_data_for_analysis(chunksize=1000)`).
+        target (str): Name of the target column. Default is 'Success Score'.
+
+    Returns:
+        pd.Series: The correlation of each feature with the target.
+    """
+    accumulator = TargetCorrelation(target)
+    for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+        accumulator.update(chunk)
+    return accumulator.correlation()
+
+
+def category_association(codes, n_categories, y):
+    """
+    Calculates the correlation ratio (η) of the target with each integer-coded categorical column.
+
+    All the columns are reduced together: the categories of each column are
+    offset to distinct bins, and the count and the sum of the centered target of
+    every category are computed with `np.bincount`, whatever the number of
+    categories. For a column with 2 categories, η is the absolute value of the
+    point-biserial correlation, whose sign is that of the mean difference
+    between the second and the first category.
+
+    Args:
+        codes (np.ndarray): Category of each row, of shape (n_rows, n_columns), -1 for missing values.
+        n_categories (np.ndarray): Number of categories of each column.
+        y (np.ndarray): The target, of shape (n_rows,).
+
+    Returns:
+        np.ndarray: η of each column, signed for the columns with 2 categories.
+        np.ndarray: The number of rows where both the column and the target are present.
+    """
+    n_columns = codes.shape[1]
+    rows, columns = np.nonzero((codes >= 0) & ~np.isnan(y)[:, None])
+    count = np.bincount(columns, minlength=n_columns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(columns, weights=y[rows], minlength=n_columns) / count
+    centered = y[rows] - mean[columns]
+
+    offsets = np.cumsum(n_categories) - n_categories
+    bins = codes[rows, columns] + offsets[columns]
+    n_bins = int(np.sum(n_categories))
+    bin_count = np.bincount(bins, minlength=n_bins)
+    bin_sum = np.bincount(bins, weights=centered, minlength=n_bins)
+    bin_columns = np.repeat(np.arange(n_columns), n_categories)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = np.bincount(bin_columns, weights=np.where(bin_count > 0, bin_sum ** 2 / bin_count, 0),
+                              minlength=n_columns)
+        eta = np.sqrt(between / np.bincount(columns, weights=centered ** 2, minlength=n_columns))
+
+    binary = n_categories == 2
+    eta[binary] *= np.sign(bin_sum[offsets[binary] + 1])
+    eta[count < 2] = np.nan
+    return eta, count
+
+
+def target_association(df, target='Success Score'):
+    """
+    Measures the association of every column with the target, whatever its type:
+    - point-biserial correlation for the binary columns (2 distinct values)
+    - correlation ratio (η, between 0 and 1) for the other non-numeric columns
+    - Pearson correlation for the other numeric columns
+
+    Args:
+        df (pd.DataFrame): The data, with categorical columns not encoded.
+        target (str): Name of the numeric target column. Default is 'Success Score'.
+
+    Returns:
+        pd.DataFrame: The 'Association', 'Measure' and 'Count' (rows where the column
+            and the target are present) of each column, by decreasing association.
+    """
+    features = df.drop(columns=target)
+    y = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+    n_unique = features.nunique()
+    numeric = features.select_dtypes(include=[np.number]).columns
+    pearson = [column for column in numeric if n_unique[column] > 2]
+    categorical = [column for column in features.columns if column not in pearson]
+
+    association = pd.DataFrame(index=features.columns, columns=['Association', 'Measure', 'Count'])
+    if pearson:
+        X = features[pearson].to_numpy(dtype=np.float64, na_value=np.nan)
+        count, _, _, m2_x, m2_y, comoment = chunk_moments(X, y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            association.loc[pearson, 'Association'] = np.where(count >= 2, comoment / np.sqrt(m2_x * m2_y), np.nan)
+        association.loc[pearson, 'Measure'] = 'pearson'
+        association.loc[pearson, 'Count'] = count.astype(np.int64)
+
+    if categorical:
+        factorized = [pd.factorize(features[column], sort=True) for column in categorical]
+        codes = np.column_stack([column_codes for column_codes, _ in factorized])
+        n_categories = np.array([len(categories) for _, categories in factorized], dtype=np.int64)
+        eta, count = category_association(codes, n_categories, y)
+        association.loc[categorical, 'Association'] = eta
+        association.loc[categorical, 'Measure'] = np.where(n_categories == 2, 'point-biserial', 'eta')
+        association.loc[categorical, 'Count'] = count
+
+    association = association.astype({'Association': np.float64, 'Count': np.int64})
+    return association.sort_values('Association', ascending=False)
+
 
 def display_correlation(df, plot=False):
     """
     Calculate and display the correlation of all features with the 'Success Score' in the given DataFrame.
+    The full correlation matrix is only computed for the heatmap.
     """
     # Select only numeric columns
     numeric_df = df.select_dtypes(include=[np.number])
     
-    # Correlation of Success score with other features
-    corr = numeric_df.corr()
-    
-    if 'Success Score' in corr.columns:
-        corr_success = corr['Success Score']
+    if 'Success Score' in numeric_df.columns:
+        # Correlation of Success score with other features
+        corr_success = target_correlation(numeric_df)
         corr_success = corr_success.sort_values(ascending=False)
-        corr_success = corr_success.drop('Success Score')
         
         if plot:
             plt.figure(figsize=(10, 8))
-            sns.heatmap(corr, annot=True, cmap='coolwarm')
+            sns.heatmap(numeric_df.corr(), annot=True, cmap='coolwarm')
             plt.show()
         
         return corr_success
@@ -1,53 +1,109 @@
+import numpy as np
 import pandas as pd
+from .backend import use_polars
+from .cache import cached_frame
+
+OSCARS_PATH = 'data/the_oscar_award.csv'
+MOVIE_STATS_PATH = 'data/movie_stats.csv'
+MOVIE_METADATA_PATH = 'data/movie.metadata.tsv'
+CHARACTER_METADATA_PATH = 'data/character.metadata.tsv'
+
+# Columns of the processed frames, as returned by the loaders
+MOVIE_STATS_COLUMNS = ['movie_name', 'rating', 'genre', 'Movie release date', 'released', 'score', 'votes', 'director',
+                       'writer', 'star', 'country', 'budget', 'gross', 'company', 'runtime']
+ORIGINAL_DATA_COLUMNS = ['Wikipedia movie ID', 'Freebase movie ID', 'movie_name', 'Movie release date', 'Movie box office revenue',
+                         'Movie runtime', 'Movie languages', 'Movie countries', 'Movie genres']
+CHARACTER_COLUMNS = ['Wikipedia movie ID', 'Freebase movie ID', 'Movie release date', 'Character name', 'Actor date of birth', 'Actor gender',
+                     'Actor height', 'Actor ethnicity', 'Actor name', 'Actor age at movie release', 'Freebase character/actor map ID',
+                     'Freebase character ID', 'Freebase actor ID']
+
+# Declared up front so that no column is inferred as a generic object column when it doesn't have to be
+CHARACTER_DTYPES = {
+    'Wikipedia movie ID': 'int64',
+    'Actor gender': pd.CategoricalDtype(['F', 'M']),
+    'Actor height': 'float64',
+    'Actor ethnicity': 'category',
+    'Actor age at movie release': 'Int64'
+}
 
 # The Oscar Award Dataset (https://www.kaggle.com/datasets/unanimad/the-oscar-award):
 
-def load_oscars_data():
+def load_oscars_data(columns=None):
     """
     Loads and processes the Oscars dataset.
 
     Reads the Oscars dataset, renames relevant columns, converts movie names 
     to lowercase, and replaces spaces with underscores. Aggregates nominations 
-    and wins by movie name.
+    and wins by movie name. The processed frame is cached on disk.
+
+    Args:
+        columns (list, optional): Subset of columns to load. Defaults to all columns.
 
     Returns:
         pd.DataFrame: A DataFrame containing processed Oscars data.
     """
 
-    oscars = pd.read_csv('data/the_oscar_award.csv')
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.load_oscars_data(columns)
+    return cached_frame(OSCARS_PATH, parse_oscars_data, 'oscars', columns)
+
+
+def parse_oscars_data():
+    """
+    Parses the Oscars CSV file into the processed Oscars DataFrame.
+    """
+
+    oscars = pd.read_csv(OSCARS_PATH)
     oscars.rename(columns={'year_film': 'Movie release date'}, inplace=True)
     oscars.rename(columns={'film': 'movie_name'}, inplace=True)
     oscars['movie_name'] = oscars['movie_name'].str.lower().str.replace(' ', '_')
 
-    oscars_to_merge = oscars.groupby(['movie_name'], as_index=False).agg({
-        'Movie release date': 'first',
-        'category': lambda x: ', '.join(f"{cat}: {name}" for cat, name in zip(x, oscars.loc[x.index, 'name'])),
-        'winner': lambda x: ', '.join(oscars.loc[x.index, 'name'][oscars.loc[x.index, 'winner']]),
-        'category': 'count'
-    }).rename(columns={'category': 'num_nominations'})
+    # Single pass over the sorted groups, the winners' names are joined per movie
+    oscars_to_merge = oscars.groupby('movie_name').agg(**{
+        'Movie release date': ('Movie release date', 'first'),
+        'num_nominations': ('category', 'count')
+    })
+    winners = oscars.loc[oscars['winner']].groupby('movie_name')['name'].agg(', '.join)
+    oscars_to_merge['winner'] = winners.reindex(oscars_to_merge.index, fill_value='')
 
-    return oscars_to_merge
+    return oscars_to_merge.reset_index()
 
 
 # TMDb Movie Dataset (https://github.com/danielgrijalva/movie-stats):
 
-def load_movie_stats():
+def load_movie_stats(columns=None):
     """
     Loads and processes the TMDb movie dataset.
 
     Reads the TMDb movie dataset, renames relevant columns, normalizes movie 
     names by converting them to lowercase and replacing spaces with underscores. 
     Converts the release year to datetime format and extracts only the year.
+    The processed frame is cached on disk.
+
+    Args:
+        columns (list, optional): Subset of columns to load. Defaults to all columns.
 
     Returns:
         pd.DataFrame: A DataFrame containing processed TMDb movie data.
     """
 
-    movie_stats = pd.read_csv('data/movie_stats.csv')
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.load_movie_stats(columns)
+    return cached_frame(MOVIE_STATS_PATH, parse_movie_stats, 'movie_stats', columns)
+
+
+def parse_movie_stats():
+    """
+    Parses the TMDb CSV file into the processed TMDb movie DataFrame.
+    """
+
+    movie_stats = pd.read_csv(MOVIE_STATS_PATH)
     movie_stats.rename(columns={'name': 'movie_name'}, inplace=True)
     movie_stats.rename(columns={'year': 'Movie release date'}, inplace=True)
     movie_stats['movie_name'] = movie_stats['movie_name'].str.lower().str.replace(' ', '_')
-    movie_stats['Movie release date'] = movie_stats['Movie release date'].apply(convert_to_datetime)
+    movie_stats['Movie release date'] = convert_release_dates(movie_stats['Movie release date'])
     movie_stats['Movie release date'] = movie_stats['Movie release date'].dt.year
 
     return movie_stats
@@ -55,22 +111,37 @@ def load_movie_stats():
 
 # CMU Movie Dataset (http://www.cs.cmu.edu/~ark/personas/):
 
-def load_original_data():
+def load_original_data(columns=None):
     """
     Loads and processes the CMU Movie dataset.
 
     Reads the CMU Movie dataset, renames relevant columns, normalizes movie 
     names by converting them to lowercase and replacing spaces with underscores.
     Converts the release date to datetime format and extracts only the year.
+    The processed frame is cached on disk.
+
+    Args:
+        columns (list, optional): Subset of columns to load. Defaults to all columns.
 
     Returns:
         pd.DataFrame: A DataFrame containing processed CMU Movie data.
     """
+
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.load_original_data(columns)
+    return cached_frame(MOVIE_METADATA_PATH, parse_original_data, 'movie_metadata', columns)
+
+
+def parse_original_data():
+    """
+    Parses the CMU movie metadata TSV file into the processed CMU Movie DataFrame.
+    """
     
-    original_data = pd.read_csv('data/movie.metadata.tsv', sep='\t', names= ['Wikipedia movie ID', 'Freebase movie ID', 'Movie name', 'Movie release date', 'Movie box office revenue', 'Movie runtime', 'Movie languages', 'Movie countries', 'Movie genres'])
+    original_data = pd.read_csv(MOVIE_METADATA_PATH, sep='\t', names= ['Wikipedia movie ID', 'Freebase movie ID', 'Movie name', 'Movie release date', 'Movie box office revenue', 'Movie runtime', 'Movie languages', 'Movie countries', 'Movie genres'])
     original_data.rename(columns={'Movie name': 'movie_name'}, inplace=True)
     original_data['movie_name'] = original_data['movie_name'].str.lower().str.replace(' ', '_')
-    original_data['Movie release date'] = original_data['Movie release date'].apply(convert_to_datetime)
+    original_data['Movie release date'] = convert_release_dates(original_data['Movie release date'])
     original_data['Movie release date'] = original_data['Movie release date'].dt.year
     
     return original_data
@@ -78,28 +149,73 @@ def load_original_data():
 
 # Freebase Character Metadataset (http://www.cs.cmu.edu/~ark/personas/):
 
-def load_character_data():
+def load_character_data(columns=None, chunksize=None):
     """
     Loads character data from the charachter.metadata TSV file (2012 dump of Freebase).
+    Column types are declared up front (categoricals for gender and ethnicity,
+    nullable integers for age). The parsed frame is cached on disk.
+
+    Args:
+        columns (list, optional): Subset of columns to load. Defaults to all columns.
+        chunksize (int, optional): If given, returns an iterator of DataFrames of 
+            `chunksize` rows instead of a single DataFrame. Defaults to None.
+
+    Returns:
+        pandas.DataFrame or Iterator[pandas.DataFrame]: DataFrame containing the character data.
+    """
+
+    if chunksize is not None:
+        return read_character_data(columns, chunksize)
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.load_character_data(columns)
+    return cached_frame(CHARACTER_METADATA_PATH, parse_character_data, 'character_metadata', columns)
+
+
+def parse_character_data():
+    """
+    Parses the character metadata TSV file into a DataFrame.
+    """
+    return read_character_data()
+
+
+def read_character_data(columns=None, chunksize=None):
+    """
+    Reads the character metadata TSV file with the declared column types.
+
+    Args:
+        columns (list, optional): Subset of columns to read. Defaults to all columns.
+        chunksize (int, optional): Number of rows per chunk. Defaults to None (whole file).
 
     Returns:
-        pandas.DataFrame: DataFrame containing the character data.
+        pandas.DataFrame or Iterator[pandas.DataFrame]: The character data.
     """
-    character_data = pd.read_csv('data/character.metadata.tsv', sep='\t', names= ['Wikipedia movie ID', 'Freebase movie ID', 'Movie release date', 'Character name', 'Actor date of birth', 'Actor gender', 
-                                 'Actor height', 'Actor ethnicity', 'Actor name', 'Actor age at movie release', 'Freebase character/actor map ID', 'Freebase character ID', 'Freebase actor ID'])
-    return character_data
+    return pd.read_csv(CHARACTER_METADATA_PATH, sep='\t', names=CHARACTER_COLUMNS, usecols=columns,
+                       dtype=CHARACTER_DTYPES, chunksize=chunksize)
 
 
-def load_actor_data_for_analysis():
+def load_actor_data_for_analysis(chunksize=None):
     """
     Loads the pre-completed actor data for analysis.
     Converts columns containing floats to int.
 
+    Args:
+        chunksize (int, optional): Number of rows per chunk. Defaults to None (whole file).
+
     Returns:
-        pandas.DataFrame: DataFrame containing the actor data for analysis.
+        pandas.DataFrame or Iterator[pandas.DataFrame]: DataFrame containing the actor data for analysis.
     """
 
-    actor_df = pd.read_csv('data/actor_data_for_analysis.csv', index_col=0)
+    actor_df = pd.read_csv('data/actor_data_for_analysis.csv', index_col=0, chunksize=chunksize)
+    if chunksize is not None:
+        return map(convert_actor_columns, actor_df)
+    return convert_actor_columns(actor_df)
+
+
+def convert_actor_columns(actor_df):
+    """
+    Converts the integer columns of the actor data for analysis, read as floats, to int.
+    """
     actor_df['Age at First Release'] = actor_df['Age at First Release'].astype('Int64')
     actor_df['Number of Children'] = actor_df['Number of Children'].astype('Int64')
     actor_df['Birth Year'] = actor_df['Birth Year'].astype('Int64')
@@ -126,3 +242,43 @@ def convert_to_datetime(date):
         return pd.to_datetime(str(date) + '-01-01')
     else:
         return pd.to_datetime(date, errors='coerce')  # Convert if it's in a full date format
+
+
+def convert_release_dates(dates):
+    """
+    Converts a column of dates to datetime format, with the same output as
+    applying `convert_to_datetime` to every value.
+
+    Each distinct raw value is parsed only once. 4-digit years and ISO dates
+    ('yyyy-mm' or 'yyyy-mm-dd') are parsed with vectorized string operations;
+    the remaining values (e.g. out-of-bounds or malformed dates) fall back to
+    `convert_to_datetime`.
+
+    Args:
+        dates (pd.Series): The raw dates (str, int or NaN).
+
+    Returns:
+        pd.Series: The converted dates as datetime64[ns], with NaT for invalid formats.
+    """
+
+    codes, uniques = pd.factorize(dates)
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=dates.index, name=dates.name, dtype='datetime64[ns]')
+
+    raw = pd.Series(uniques).astype(str)
+    converted = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+
+    # Only keep years inside the datetime64[ns] bounds on the vectorized path
+    year = pd.to_numeric(raw.str[:4], errors='coerce')
+    in_bounds = year.between(1678, 2261)
+    year_only = raw.str.fullmatch(r'\d{4}') & in_bounds
+    iso_date = raw.str.fullmatch(r'\d{4}-\d{2}(-\d{2})?') & in_bounds
+    remaining = ~(year_only | iso_date)
+
+    converted[year_only] = pd.to_datetime(raw[year_only] + '-01-01', format='%Y-%m-%d')
+    converted[iso_date] = pd.to_datetime(raw[iso_date], format='ISO8601', errors='coerce')
+    converted[remaining] = [convert_to_datetime(date) for date in uniques[remaining.to_numpy()]]
+
+    # Missing values are not factorized and stay NaT
+    values = np.where(codes >= 0, converted.to_numpy()[codes], np.datetime64('NaT'))
+    return pd.Series(values, index=dates.index, name=dates.name, dtype='datetime64[ns]')
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+HANDLE_UNKNOWN = ('ignore', 'error')
+
+
+class CategoricalEncoder:
+    """
+    One-hot encoder of categorical columns into a sparse CSR matrix.
+
+    The vocabulary is learned once with `fit` and then fixed: each category keeps
+    its column, so every call to `transform` (e.g. on chunks of a file, or on new
+    data at prediction time) gives the same columns. After `fit`, the columns are
+    those of `pd.get_dummies`, named '<column>_<category>', with the categories of
+    each column sorted. `partial_fit` appends the columns of new categories at the
+    end, leaving the existing ones in place.
+
+    Missing values have no column. Unknown categories are encoded as all-zero
+    rows with handle_unknown='ignore', or raise a ValueError with 'error'.
+    """
+
+    def __init__(self, columns, handle_unknown='ignore'):
+        if handle_unknown not in HANDLE_UNKNOWN:
+            raise ValueError(f"Unknown handle_unknown '{handle_unknown}', expected one of {HANDLE_UNKNOWN}.")
+        self.columns = list(columns)
+        self.handle_unknown = handle_unknown
+        # Column of each category in the encoded matrix
+        self.positions = {column: {} for column in self.columns}
+        self.feature_names = []
+
+    @classmethod
+    def from_categories(cls, categories, handle_unknown='ignore'):
+        """
+        Creates an encoder from the categories of each column, e.g. saved with `categories`.
+        """
+        encoder = cls(categories, handle_unknown)
+        for column, values in categories.items():
+            encoder._add(column, values)
+        return encoder
+
+    @property
+    def categories(self):
+        """
+        The categories of each column, in the order of their columns.
+        """
+        return {column: list(positions) for column, positions in self.positions.items()}
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def fit(self, df):
+        """
+        Learns the sorted categories of each column, replacing any previous vocabulary.
+        """
+        self.positions = {column: {} for column in self.columns}
+        self.feature_names = []
+        for column in self.columns:
+            self._add(column, pd.Categorical(df[column]).categories)
+        return self
+
+    def partial_fit(self, df):
+        """
+        Adds the columns of the categories not seen yet, after the existing columns.
+        """
+        for column in self.columns:
+            uniques = pd.unique(df[column].dropna())
+            self._add(column, [category for category in uniques if category not in self.positions[column]])
+        return self
+
+    def transform(self, df):
+        """
+        Encodes the categorical columns of a DataFrame.
+
+        Args:
+            df (pd.DataFrame): Data with the encoded columns.
+
+        Returns:
+            csr_matrix: The one-hot matrix of shape (len(df), n_features), of type uint8.
+        """
+        rows, features = [], []
+        for column in self.columns:
+            codes, uniques = pd.factorize(df[column])
+            positions = np.array([self.positions[column].get(category, -1) for category in uniques], dtype=np.int64)
+            if self.handle_unknown == 'error' and (positions < 0).any():
+                raise ValueError(f"Unknown categories {list(uniques[positions < 0])} in column '{column}'.")
+
+            # Missing values (code -1) and unknown categories have no column
+            known = codes >= 0
+            known[known] = positions[codes[known]] >= 0
+            rows.append(np.flatnonzero(known))
+            features.append(positions[codes[known]])
+
+        rows, features = np.concatenate(rows), np.concatenate(features)
+        return csr_matrix((np.ones(len(rows), dtype=np.uint8), (rows, features)), shape=(len(df), self.n_features))
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def transform_chunks(self, chunks):
+        """
+        Encodes an iterator of DataFrames, e.g. read with `chunksize`, one chunk at a time.
+
+        Yields:
+            csr_matrix: The one-hot matrix of each chunk.
+        """
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def _add(self, column, categories):
+        for category in categories:
+            self.positions[column][category] = len(self.feature_names)
+            self.feature_names.append(f'{column}_{category}')
@@ -0,0 +1,53 @@
+import json
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+# Sparse multi-hot encoding of a Freebase field: one row per movie, one column per vocabulary entry
+MultiHot = namedtuple('MultiHot', ['matrix', 'vocabulary'])
+
+
+def parse_freebase_dicts(column):
+    """
+    Parses a column of Freebase dictionaries (e.g. '{"/m/07s9rl0": "Drama"}').
+
+    The cells are JSON objects, so the whole column is decoded with a single
+    `json.loads` call instead of one `eval` per cell. Missing cells are parsed
+    as empty dictionaries.
+
+    Args:
+        column (pd.Series): Column of JSON-encoded dictionaries.
+
+    Returns:
+        list[dict]: The parsed dictionaries, in the order of the column.
+    """
+
+    return json.loads('[' + ','.join(column.fillna('{}')) + ']')
+
+
+def multi_hot(parsed):
+    """
+    Builds a sparse multi-hot matrix from parsed Freebase dictionaries.
+
+    Args:
+        parsed (list[dict]): Parsed dictionaries, as returned by `parse_freebase_dicts`.
+
+    Returns:
+        MultiHot: A CSR matrix of shape (len(parsed), len(vocabulary)) with 1 where
+            the movie has the value, and the sorted vocabulary of values.
+    """
+
+    lengths = np.fromiter(map(len, parsed), dtype=np.int64, count=len(parsed))
+    values = pd.Series(list(chain.from_iterable(d.values() for d in parsed)), dtype=object)
+    codes, vocabulary = pd.factorize(values, sort=True)
+
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    matrix = csr_matrix((np.ones(len(codes), dtype=np.int8), codes, indptr), shape=(len(parsed), len(vocabulary)))
+
+    # A value listed under two Freebase IDs is counted once
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return MultiHot(matrix, pd.Index(vocabulary))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Integer columns the movie datasets are joined on
+KEY_COLUMNS = ['title_id', 'year_key']
+
+
+class TitleKeyEncoder:
+    """
+    Interns normalized movie titles into a shared integer dictionary, so that
+    datasets can be joined on (int32 title id, int16 release year) instead of
+    hashing the title strings at every merge.
+
+    The dictionary only grows: a title keeps its id for the lifetime of the
+    encoder, whichever dataset it was first seen in.
+    """
+
+    def __init__(self):
+        self.titles = pd.Index([], dtype=object)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def title_ids(self, titles):
+        """
+        Returns the ids of the given titles, adding unseen titles to the dictionary.
+
+        Missing titles get an id too, so they are matched together as in a
+        merge on the title strings.
+
+        Args:
+            titles (pd.Series): Normalized movie titles.
+
+        Returns:
+            np.ndarray: The int32 title ids.
+        """
+
+        ids = self.titles.get_indexer(titles)
+        unseen = ids == -1
+        if unseen.any():
+            new_titles = pd.unique(titles[unseen])
+            self.titles = self.titles.append(pd.Index(new_titles, dtype=object))
+            ids[unseen] = self.titles.get_indexer(titles[unseen])
+        return ids.astype(np.int32)
+
+    def encode(self, df, title_column='movie_name', year_column='Movie release date'):
+        """
+        Adds the integer join keys 'title_id' and 'year_key' to a DataFrame.
+
+        Missing years are encoded as -1.
+
+        Args:
+            df (pd.DataFrame): DataFrame with normalized titles and release years.
+            title_column (str): Name of the title column. Defaults to 'movie_name'.
+            year_column (str): Name of the release year column. Defaults to 'Movie release date'.
+
+        Returns:
+            pd.DataFrame: A copy of `df` with the key columns.
+        """
+
+        return df.assign(title_id=self.title_ids(df[title_column]),
+                         year_key=df[year_column].fillna(-1).astype(np.int16))
+
+    def decode(self, title_ids):
+        """
+        Returns the normalized titles of the given ids.
+        """
+        return self.titles[np.asarray(title_ids)]
+
+
+# Dictionary shared by all the datasets of the pipeline
+title_keys = TitleKeyEncoder()
@@ -0,0 +1,172 @@
+import polars as pl
+
+from .data_loader import OSCARS_PATH, MOVIE_STATS_PATH, MOVIE_METADATA_PATH, CHARACTER_METADATA_PATH
+from .data_loader import CHARACTER_COLUMNS, CHARACTER_DTYPES, MOVIE_STATS_COLUMNS, ORIGINAL_DATA_COLUMNS
+
+# Polars implementations of the loaders and transforms, selected with `set_backend('polars')`.
+# Everything up to the final `collect` is a single lazy query; pandas frames are only produced at the end.
+
+JOIN_COLUMNS = ['movie_name', 'Movie release date']
+
+
+def normalize_title(column):
+    """
+    Converts movie names to lowercase and replaces spaces with underscores.
+    """
+    return pl.col(column).str.to_lowercase().str.replace_all(' ', '_', literal=True)
+
+
+def release_year(column):
+    """
+    Extracts the release year like `convert_release_dates`: 4-digit years and
+    valid 'yyyy-mm' / 'yyyy-mm-dd' dates, null otherwise.
+    """
+    raw = pl.col(column).cast(pl.String)
+    year = raw.str.slice(0, 4).cast(pl.Int32, strict=False)
+    # Same bounds as pandas' datetime64[ns]
+    in_bounds = year.is_between(1678, 2261)
+    year_only = raw.str.contains(r'^\d{4}$')
+    iso_date = raw.str.contains(r'^\d{4}-\d{2}(-\d{2})?$')
+    date = pl.when(raw.str.len_chars() == 7).then(raw + '-01').otherwise(raw).str.to_date('%Y-%m-%d', strict=False)
+
+    return pl.when(in_bounds & year_only).then(year).when(in_bounds & iso_date).then(date.dt.year())
+
+
+def scan_oscars_data():
+    """
+    Returns the lazy query of the processed Oscars data.
+    """
+    oscars = pl.scan_csv(OSCARS_PATH).rename({'year_film': 'Movie release date', 'film': 'movie_name'})
+    return (oscars
+            .with_columns(normalize_title('movie_name'))
+            .filter(pl.col('movie_name').is_not_null())
+            .group_by('movie_name')
+            .agg(pl.col('Movie release date').drop_nulls().first(),
+                 pl.col('category').count().cast(pl.Int64).alias('num_nominations'),
+                 pl.col('name').filter(pl.col('winner')).str.join(', ').alias('winner'))
+            .sort('movie_name'))
+
+
+def scan_movie_stats():
+    """
+    Returns the lazy query of the processed TMDb movie data.
+    """
+    movie_stats = pl.scan_csv(MOVIE_STATS_PATH, infer_schema_length=None)
+    return (movie_stats
+            .rename({'name': 'movie_name', 'year': 'Movie release date'})
+            .with_columns(normalize_title('movie_name'), release_year('Movie release date')))
+
+
+def scan_original_data():
+    """
+    Returns the lazy query of the processed CMU Movie data.
+    """
+    names = ['Movie name' if col == 'movie_name' else col for col in ORIGINAL_DATA_COLUMNS]
+    original_data = pl.scan_csv(MOVIE_METADATA_PATH, separator='\t', has_header=False, new_columns=names,
+                                schema_overrides={'Movie release date': pl.String}, infer_schema_length=None)
+    return (original_data
+            .rename({'Movie name': 'movie_name'})
+            .with_columns(normalize_title('movie_name'), release_year('Movie release date').cast(pl.Float64)))
+
+
+def scan_character_data(columns=None):
+    """
+    Returns the lazy query of the character data. Column types are applied
+    when converting to pandas, see `to_pandas`.
+    """
+    character_data = pl.scan_csv(CHARACTER_METADATA_PATH, separator='\t', has_header=False, new_columns=CHARACTER_COLUMNS,
+                                 schema_overrides={'Movie release date': pl.String, 'Actor date of birth': pl.String},
+                                 infer_schema_length=None)
+    return character_data if columns is None else character_data.select(columns)
+
+
+def to_pandas(query):
+    """
+    Collects a lazy query into a pandas DataFrame with the declared character column types.
+    """
+    df = query.collect().to_pandas()
+    return df.astype({col: dtype for col, dtype in CHARACTER_DTYPES.items() if col in df.columns})
+
+
+def load_oscars_data(columns=None):
+    oscars = scan_oscars_data()
+    return to_pandas(oscars if columns is None else oscars.select(columns))
+
+
+def load_movie_stats(columns=None):
+    movie_stats = scan_movie_stats()
+    return to_pandas(movie_stats if columns is None else movie_stats.select(columns))
+
+
+def load_original_data(columns=None):
+    original_data = scan_original_data()
+    return to_pandas(original_data if columns is None else original_data.select(columns))
+
+
+def load_character_data(columns=None):
+    return to_pandas(scan_character_data(columns))
+
+
+def scan_merged_data(exclude=()):
+    """
+    Returns the lazy query merging the CMU, TMDb and Oscars data on ('movie_name', 'Movie release date').
+    """
+    # Join keys must have the same type, the CMU years are floats
+    oscars = scan_oscars_data().with_columns(pl.col('Movie release date').cast(pl.Float64))
+    movie_stats = (scan_movie_stats()
+                   .select([col for col in MOVIE_STATS_COLUMNS if col not in exclude])
+                   .with_columns(pl.col('Movie release date').cast(pl.Float64)))
+    original_data = scan_original_data().select([col for col in ORIGINAL_DATA_COLUMNS if col not in exclude])
+
+    return (original_data
+            .join(movie_stats, on=JOIN_COLUMNS, how='left', nulls_equal=True, maintain_order='left')
+            .join(oscars, on=JOIN_COLUMNS, how='left', nulls_equal=True, maintain_order='left'))
+
+
+def merge_data(exclude=()):
+    return to_pandas(scan_merged_data(exclude))
+
+
+def renamed_merged_data(exclude, renames):
+    """
+    Merges, renames and types the raw movie data in one query. The Freebase
+    fields are left as JSON strings.
+    """
+    query = (scan_merged_data(exclude)
+             .with_columns(pl.col('Movie release date').cast(pl.Int64))
+             .rename(renames))
+    merged_data = to_pandas(query)
+    merged_data['Movie release date'] = merged_data['Movie release date'].astype('Int64')
+    return merged_data
+
+
+def complete_rows(df, subset):
+    """
+    Returns the boolean mask of the rows with no missing value in `subset`.
+    """
+    query = pl.from_pandas(df[subset]).select(pl.all_horizontal(pl.all().is_not_null()))
+    return query.to_series().to_numpy()
+
+
+def actor_data(clean_df, character_columns, movie_columns):
+    """
+    Joins the character data with the movies and counts the movies of each actor.
+    """
+    movies = pl.from_pandas(clean_df[movie_columns]).lazy()
+    characters = scan_character_data(character_columns)
+
+    # Same suffixes as pandas for the release date of both tables
+    characters = characters.rename({'Movie release date': 'Movie release date_x'})
+    movies = movies.rename({'Movie release date': 'Movie release date_y'})
+
+    query = characters.join(movies, on='Freebase movie ID', how='inner', maintain_order='left')
+    if 'Movie star' in movie_columns:
+        query = query.with_columns(normalize_title('Movie star'))
+    query = (query
+             .with_columns(normalize_title('Actor name'))
+             .filter(pl.col('Actor name').is_not_null())
+             .with_columns(pl.col('Movie name').count().over('Actor name').cast(pl.Int64).alias('Movie Count')))
+
+    merged_df = to_pandas(query)
+    merged_df['Movie release date_y'] = merged_df['Movie release date_y'].astype('Int64')
+    return merged_df
@@ -1,63 +1,127 @@
 import pandas as pd
 from .data_loader import load_oscars_data, load_movie_stats, load_original_data, load_character_data
-
-def merge_data():
+from .data_loader import MOVIE_STATS_COLUMNS, ORIGINAL_DATA_COLUMNS
+from .join_keys import title_keys, KEY_COLUMNS
+from .freebase_fields import parse_freebase_dicts, multi_hot
+from .backend import use_polars
+
+# Character columns used in the actor analysis
+ACTOR_CHARACTER_COLUMNS = ['Freebase movie ID', 'Movie release date', 'Actor date of birth', 'Actor gender', 'Actor height',
+                           'Actor ethnicity', 'Actor name', 'Actor age at movie release']
+
+# Movie columns used by the actor success index
+ACTOR_MOVIE_COLUMNS = ['Freebase movie ID', 'Movie name', 'Movie release date', 'Movie star', 'Movie Success Index']
+
+# Freebase dictionary fields of the CMU dataset
+FREEBASE_FIELDS = ['Movie languages', 'Movie countries', 'Movie genres']
+
+# Columns that are not used in the analysis
+IRRELEVANT_COLUMNS = ['Wikipedia movie ID', 'genre', 'released', 'country', 'runtime', 'rating', 'writer']
+
+# Rename columns for consistency
+RAW_DATA_RENAMES = {
+    'movie_name': 'Movie name',
+    'score': 'Review score',
+    'votes': 'Movie votes',
+    'director': 'Movie director',
+    'star': 'Movie star',
+    'budget': 'Movie budget',
+    'gross': 'Movie gross',
+    'company': 'Movie company',
+    'num_nominations': 'Number of nomination',
+    'winner': 'Nomination winner'
+}
+
+# Columns that must be available for the analysis
+ESSENTIAL_COLUMNS = ['Movie box office revenue', 'Movie budget', 'Review score', 'Movie votes']
+
+
+def merge_data(exclude=(), keys=None):
     """
     Merges data from all three datasets into a single DataFrame.
 
     This function merges data from the Oscars, TMDb, and CMU Movie datasets
-    on common columns ('movie_name' and 'Movie release date').
+    on common columns ('movie_name' and 'Movie release date'). The titles are 
+    first interned in an integer dictionary, and the merges run on the integer 
+    keys (title id, release year). The key columns are dropped after the merges:
+    the title ids are only valid for the in-memory dictionary `keys`, and the
+    merged data is cached on disk by the pipeline.
+
+    Args:
+        exclude (iterable, optional): Columns of the TMDb and CMU datasets that are not loaded.
+        keys (TitleKeyEncoder, optional): Title dictionary to use. Defaults to the shared `title_keys`.
 
     Returns:
         pd.DataFrame: A DataFrame containing merged data from all three datasets.
     """
 
-    oscars_data = load_oscars_data()
-    movie_stats = load_movie_stats()
-    original_data = load_original_data()
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.merge_data(exclude)
+
+    keys = title_keys if keys is None else keys
+
+    oscars_data = keys.encode(load_oscars_data())
+    movie_stats = keys.encode(load_movie_stats(columns=[col for col in MOVIE_STATS_COLUMNS if col not in exclude]))
+    original_data = keys.encode(load_original_data(columns=[col for col in ORIGINAL_DATA_COLUMNS if col not in exclude]))
+
+    # The title and year are already carried by the CMU data
+    oscars_data = oscars_data.drop(columns=['movie_name', 'Movie release date'])
+    movie_stats = movie_stats.drop(columns=['movie_name', 'Movie release date'])
 
     # merge datasets
-    merged_data = pd.merge(original_data, movie_stats, on=['movie_name', 'Movie release date'], how='left')
-    final_merged_data = merged_data.merge(oscars_data, on=['movie_name', 'Movie release date'], how='left')
+    merged_data = pd.merge(original_data, movie_stats, on=KEY_COLUMNS, how='left')
+    final_merged_data = merged_data.merge(oscars_data, on=KEY_COLUMNS, how='left')
     
-    return final_merged_data
+    return final_merged_data.drop(columns=KEY_COLUMNS)
 
 
-def raw_data():
+def raw_data(multi_hot_fields=False, readable=True):
     """
     Cleans the merged movie dataset by dropping irrelevant columns and renaming
     columns for consistency.
 
+    The Freebase genres, countries and languages fields are parsed once. They
+    can be returned as sparse multi-hot matrices, whose rows follow the rows
+    of the DataFrame.
+
+    Args:
+        multi_hot_fields (bool, optional): If True, also returns the multi-hot 
+            encodings of the Freebase fields. Defaults to False.
+        readable (bool, optional): If True, genres and countries are converted to
+            comma-separated strings. If False, the three Freebase columns are dropped
+            (use with `multi_hot_fields`). Defaults to True.
+
     Returns:
         pd.DataFrame: A cleaned DataFrame ready for analysis.
+        dict[str, MultiHot]: Only if `multi_hot_fields` is True. The multi-hot
+            encoding of each Freebase field, keyed by column name.
     """
 
-    merged_data = merge_data()
+    if use_polars():
+        from . import polars_backend
+        merged_data = polars_backend.renamed_merged_data(IRRELEVANT_COLUMNS, RAW_DATA_RENAMES)
+    else:
+        # Irrelevant columns are not loaded
+        merged_data = merge_data(exclude=IRRELEVANT_COLUMNS)
 
-    # Drop irrelevant columns
-    merged_data.drop(columns=['Wikipedia movie ID', 'genre', 'released', 'country', 'runtime', 'rating', 'writer'], inplace=True)
+        # Rename columns for consistency
+        merged_data.rename(columns=RAW_DATA_RENAMES, inplace=True)
 
-    # Rename columns for consistency
-    merged_data.rename(columns={
-        'movie_name': 'Movie name',
-        'score': 'Review score',
-        'votes': 'Movie votes',
-        'director': 'Movie director',
-        'star': 'Movie star',
-        'budget': 'Movie budget',
-        'gross': 'Movie gross',
-        'company': 'Movie company',
-        'num_nominations': 'Number of nomination',
-        'winner': 'Nomination winner'
-    }, inplace=True)
+        # Change type
+        merged_data['Movie release date'] = merged_data['Movie release date'].astype('Int64')
 
-    # Change type
-    merged_data['Movie release date'] = merged_data['Movie release date'].astype('Int64')
+    parsed = {col: parse_freebase_dicts(merged_data[col]) for col in FREEBASE_FIELDS}
 
-    # Convert genres and countries to comma-separated strings
-    merged_data['Movie genres'] = merged_data['Movie genres'].apply(eval).apply(get_key_values)
-    merged_data['Movie countries'] = merged_data['Movie countries'].apply(eval).apply(get_key_values)
+    if readable:
+        # Convert genres and countries to comma-separated strings
+        merged_data['Movie genres'] = [get_key_values(x) for x in parsed['Movie genres']]
+        merged_data['Movie countries'] = [get_key_values(x) for x in parsed['Movie countries']]
+    else:
+        merged_data.drop(columns=FREEBASE_FIELDS, inplace=True)
 
+    if multi_hot_fields:
+        return merged_data, {col: multi_hot(values) for col, values in parsed.items()}
     return merged_data
 
 
@@ -69,7 +133,11 @@ def clean_data(raw_data):
     pandas.DataFrame: Cleaned data
     """
     # Drop rows with NA values in essential columns
-    clean_data = raw_data.dropna(subset=['Movie box office revenue', 'Movie budget', 'Review score', 'Movie votes']).copy()
+    if use_polars():
+        from . import polars_backend
+        return raw_data[polars_backend.complete_rows(raw_data, ESSENTIAL_COLUMNS)].copy()
+
+    clean_data = raw_data.dropna(subset=ESSENTIAL_COLUMNS).copy()
     return clean_data
 
 
@@ -87,15 +155,58 @@ def get_key_values(x):
     return ', '.join(x.values())
 
 
-def actor_data(clean_df):
+def actor_data(clean_df, chunksize=None, columns=ACTOR_MOVIE_COLUMNS):
     """
     Merges character data with the cleaned DataFrame on 'Freebase movie ID'
     and calculates the movie count for each actor.
+
+    Only the character columns used in the actor analysis are loaded, and only
+    the movie columns in `columns` are joined onto the characters. By default
+    these are the columns used by `actor_success_index`; the other movie 
+    attributes can be looked up by movie ID with `movie_attributes`. If 
+    `chunksize` is given, the character file is streamed and joined chunk by
+    chunk, so that the full character table is never held in memory.
+
+    Args:
+        clean_df (pd.DataFrame): The cleaned movie DataFrame.
+        chunksize (int, optional): Number of character rows per chunk. Defaults to None.
+        columns (list, optional): Movie columns to join. 'Freebase movie ID', 'Movie name'
+            and 'Movie release date' are always joined, the columns missing from `clean_df`
+            (e.g. 'Movie Success Index' before the movies are scored) are skipped. None joins
+            all the columns. Defaults to `ACTOR_MOVIE_COLUMNS`.
+
+    Returns:
+        pd.DataFrame: One row per character appearing in a movie of `clean_df`.
     """
-    merged_df = pd.merge(load_character_data(), clean_df, on='Freebase movie ID', how='inner')
-    merged_df['Movie star'] = merged_df['Movie star'].str.lower().str.replace(' ', '_')
+    if columns is not None:
+        columns = dict.fromkeys(['Freebase movie ID', 'Movie name', 'Movie release date', *columns])
+        clean_df = clean_df[[column for column in columns if column in clean_df.columns]]
+
+    if use_polars():
+        from . import polars_backend
+        return polars_backend.actor_data(clean_df, ACTOR_CHARACTER_COLUMNS, list(clean_df.columns))
+
+    if chunksize is None:
+        merged_df = pd.merge(load_character_data(ACTOR_CHARACTER_COLUMNS), clean_df, on='Freebase movie ID', how='inner')
+    else:
+        chunks = load_character_data(ACTOR_CHARACTER_COLUMNS, chunksize=chunksize)
+        merged_df = pd.concat([pd.merge(chunk, clean_df, on='Freebase movie ID', how='inner') for chunk in chunks],
+                              ignore_index=True)
+        # Categories differ between chunks
+        merged_df['Actor ethnicity'] = merged_df['Actor ethnicity'].astype('category')
+
+    if 'Movie star' in merged_df.columns:
+        merged_df['Movie star'] = merged_df['Movie star'].str.lower().str.replace(' ', '_')
     merged_df['Actor name'] = merged_df['Actor name'].str.lower().str.replace(' ', '_')
     merged_df = merged_df.dropna(subset=['Actor name'])
     merged_df['Movie Count'] = merged_df.groupby('Actor name')['Movie name'].transform('count')
 
     return merged_df
+
+
+def movie_attributes(clean_df):
+    """
+    Returns the movie attributes indexed by 'Freebase movie ID', to look up the 
+    columns that `actor_data` doesn't join onto the characters.
+    """
+    return clean_df.set_index('Freebase movie ID')
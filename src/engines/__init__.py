@@ -1,7 +1,10 @@
 from .ethnicity_label_converting import EntityConverterEngine
 from .university_matching import UniversityMatchEngine
 from .webscraping import ActorScraperEngine
+from .http_client import HttpClient
 
-converter = EntityConverterEngine()
+# Connection pool shared by the engines
+http_client = HttpClient()
+converter = EntityConverterEngine(http_client=http_client)
 university_matcher = UniversityMatchEngine()
-spider = ActorScraperEngine()
+spider = ActorScraperEngine(http_client=http_client)
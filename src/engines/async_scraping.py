@@ -0,0 +1,161 @@
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import aiohttp
+from tqdm import tqdm
+from urllib3.exceptions import InvalidHeader, MaxRetryError
+
+from .http_client import retry_policy
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing `rate` requests per second on average, and bursts of up to `burst` requests.
+
+    Waiting requests are served in arrival order.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            if self.updated is None:
+                self.updated = loop.time()
+            while True:
+                now = loop.time()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def retry_delay(retry, retry_after=None):
+    """
+    Returns the seconds to wait before the next attempt of a request: the delay
+    of its `Retry-After` header if the policy respects it, else the backoff of `retry`.
+    """
+    if retry_after is not None and retry.respect_retry_after_header:
+        try:
+            return retry.parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass
+    return retry.get_backoff_time()
+
+
+async def fetch_pages(urls, parse, concurrency=8, rate=0.5, burst=1, headers=None, timeout=30, executor=None,
+                      retry=None):
+    """
+    Fetches pages concurrently and parses them off the event loop.
+
+    At most `concurrency` requests are in flight, and the requests to each host
+    are limited to `rate` per second by a `TokenBucket`. The responses are
+    parsed in `executor` (by default a thread pool), so that parsing does not
+    block the requests. Failed requests and responses with a retryable status
+    are retried with the same policy as `HttpClient`: after the delay of the
+    `Retry-After` header, or with exponential backoff. A request waiting for its
+    retry does not count towards `concurrency`, and its retries are rate limited.
+
+    Args:
+        urls (list): The pages to fetch.
+        parse (callable): Called as `parse(index, status, text)` for each page, with
+            a status of None and the error message as text if the request failed.
+        concurrency (int): Maximum number of requests in flight. Default is 8.
+        rate (float): Maximum requests per second to each host. Default is 0.5.
+        burst (int): Number of requests a host can receive at once after being idle. Default is 1.
+        headers (dict, optional): Headers of the requests.
+        timeout (float): Timeout of each request in seconds. Default is 30.
+        executor (Executor, optional): Executor of `parse`.
+        retry (urllib3.util.Retry, optional): Retry policy of the requests. Defaults to `retry_policy()`.
+
+    Returns:
+        list: The result of `parse` for each page, in the order of `urls`.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    buckets = defaultdict(lambda: TokenBucket(rate, burst))
+    progress = tqdm(total=len(urls))
+
+    retry = retry_policy() if retry is None else retry
+
+    async def fetch(session, index, url):
+        attempt = retry
+        while True:
+            error, retry_after = None, None
+            async with semaphore:
+                await buckets[urlsplit(url).netloc].acquire()
+                try:
+                    async with session.get(url) as response:
+                        status, text = response.status, await response.text()
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status, text, error = None, str(e) or type(e).__name__, e
+
+            if status is not None and not attempt.is_retry('GET', status, retry_after is not None):
+                break
+            try:
+                attempt = attempt.increment('GET', url, error=error)
+            except MaxRetryError:
+                # Retries exhausted: the last response or error is parsed
+                break
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+
+        result = await loop.run_in_executor(executor, parse, index, status, text)
+        progress.update()
+        return result
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=timeout),
+                                     connector=connector) as session:
+        try:
+            return await asyncio.gather(*(fetch(session, index, url) for index, url in enumerate(urls)))
+        finally:
+            progress.close()
+
+
+def run_coroutine(coroutine):
+    """
+    Runs a coroutine to completion, in a new thread if an event loop is already running (e.g. in Jupyter).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def scrape_actors(engine, actor_names, concurrency=8, rate=0.5):
+    """
+    Fetches and parses the Wikipedia page of each actor with `fetch_pages`,
+    retrying the requests with the policy of the engine's `HttpClient`.
+
+    Args:
+        engine (ActorScraperEngine): Engine building the URLs and parsing the pages.
+        actor_names (list): Names of the actors.
+        concurrency (int): Maximum number of requests in flight. Default is 8.
+        rate (float): Maximum requests per second to Wikipedia. Default is 0.5.
+
+    Returns:
+        list: The data of each actor, as returned by `fetch_wikipedia_data`.
+    """
+    actor_names = list(actor_names)
+
+    def parse(index, status, text):
+        if status is None:
+            print(f"Error fetching data for {actor_names[index]}: {text}")
+            return engine.initialize_data()
+        return engine.parse_response(actor_names[index], status, text)
+
+    urls = [engine.construct_url(actor_name) for actor_name in actor_names]
+    return run_coroutine(fetch_pages(urls, parse, concurrency, rate, headers={"User-Agent": "Mozilla/5.0"},
+                                     retry=engine.http_client.retry))
@@ -1,16 +1,16 @@
 # Copyright (c) 2012-2022 Yuanchun Shen (https://github.com/happen2me/freebase-wikidata-convert)
 
 import requests
-from SPARQLWrapper import JSON, SPARQLWrapper
+
+from .http_client import HttpClient
 
 class EntityConverterEngine:
     """
     Entity converter converts between Freebase and Wikidata entity IDs.
     """
-    def __init__(self, endpoint="https://query.wikidata.org/sparql") -> None:
-        sparql = SPARQLWrapper(endpoint)
-        sparql.setReturnFormat(JSON)
-        self.sparql = sparql
+    def __init__(self, endpoint="https://query.wikidata.org/sparql", http_client=None) -> None:
+        self.endpoint = endpoint
+        self.http_client = http_client or HttpClient()
         self.ethnicity_data = {} # Dictionary to store the mapping between MIDs and ethnicity labels
         self.seen_mids = set()  # Set to keep track of unique MIDs
     
@@ -24,10 +24,12 @@ class EntityConverterEngine:
         Returns:
             dict: SPARQL query result
         """
-        self.sparql.setQuery(query)
         try:
-            ret = self.sparql.queryAndConvert()
-            return ret
+            # SPARQL protocol query, sent with the pooled session of the engine
+            response = self.http_client.get(self.endpoint, params={'query': query, 'format': 'json'},
+                                            headers={'Accept': 'application/sparql-results+json'})
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             print(f"Error with query wikidata: {e}")
             return None
@@ -84,7 +86,7 @@ class EntityConverterEngine:
         }
 
         try:
-            response = requests.get(url, params=params)
+            response = self.http_client.get(url, params=params)
             response.raise_for_status()  # Raise an exception for HTTP errors
             data = response.json()
 
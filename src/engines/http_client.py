@@ -0,0 +1,73 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connect and read timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Statuses worth retrying: rate limiting and server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def retry_policy(max_retries=5, backoff_factor=0.5, backoff_jitter=0.5, backoff_max=60):
+    """
+    Returns the retry policy of the engines, see `HttpClient`.
+    """
+    return Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        backoff_max=backoff_max,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class HttpClient:
+    """
+    HTTP client shared by the engines.
+
+    Requests go through a single `requests.Session`, whose connections are kept
+    alive and pooled per host, so consecutive requests to Wikipedia or Wikidata
+    reuse the same TCP/TLS connection. Every request has a timeout. Connection
+    errors and responses with a status of `RETRY_STATUSES` are retried with
+    exponential backoff (`backoff_factor * 2 ** retry` seconds, plus a random
+    jitter of up to `backoff_jitter` seconds, at most `backoff_max`), or after
+    the delay given by the `Retry-After` header of 429 and 503 responses.
+    Once the retries are exhausted, the last response is returned.
+
+    Args:
+        timeout (float or tuple): Timeout of the requests, or (connect, read) timeouts. Default is `DEFAULT_TIMEOUT`.
+        max_retries (int): Maximum number of retries of a request. Default is 5.
+        backoff_factor (float): Base delay of the backoff in seconds. Default is 0.5.
+        backoff_jitter (float): Maximum random delay added to the backoff in seconds. Default is 0.5.
+        backoff_max (float): Maximum delay of the backoff in seconds. Default is 60.
+        pool_maxsize (int): Number of connections kept alive per host. Default is 10.
+        headers (dict, optional): Headers sent with every request.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=5, backoff_factor=0.5, backoff_jitter=0.5,
+                 backoff_max=60, pool_maxsize=10, headers=None):
+        self.timeout = timeout
+        self.retry = retry_policy(max_retries, backoff_factor, backoff_jitter, backoff_max)
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=self.retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request with the session, see `requests.Session.request`.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        self.session.close()
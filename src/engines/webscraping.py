@@ -1,15 +1,20 @@
-import requests
 import random
 import time
 import re
+from importlib.util import find_spec
 
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 
+from .http_client import HttpClient
+
+# Requests per second of the async mode: the 1 to 3 s delay of the blocking mode
+ASYNC_RATE = 0.5
+
 class ActorScraperEngine:
-    def __init__(self):
+    def __init__(self, http_client=None):
         self.base_url = "https://en.wikipedia.org/wiki/"
-        pass
+        self.http_client = http_client or HttpClient()
 
     def process_part(self, part):
         """
@@ -70,16 +75,26 @@ class ActorScraperEngine:
         """
         Fetch actor data from Wikipedia.
         """
-        data = self.initialize_data()
-
         try:
             url = self.construct_url(actor_name)
             response = self.get_response(url)
-            if response.status_code != 200:
-                print(f"Failed to fetch data for {actor_name}: HTTP {response.status_code}")
-                return data
+        except Exception as e:
+            print(f"Error fetching data for {actor_name}: {e}")
+            return self.initialize_data()
+
+        return self.parse_response(actor_name, response.status_code, response.text)
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+    def parse_response(self, actor_name, status_code, html):
+        """
+        Parses the Wikipedia page of an actor, or returns empty data if the request failed.
+        """
+        data = self.initialize_data()
+        if status_code != 200:
+            print(f"Failed to fetch data for {actor_name}: HTTP {status_code}")
+            return data
+
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
             data['Gender'] = self.determine_gender(soup)
             infobox = soup.find('table', class_='infobox')
             if infobox:
@@ -115,7 +130,7 @@ class ActorScraperEngine:
         """
         Sends a GET request to the specified URL with a custom User-Agent header.
         """
-        return requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        return self.http_client.get(url, headers={"User-Agent": "Mozilla/5.0"})
 
     def determine_gender(self, soup):
         """
@@ -314,9 +329,19 @@ class ActorScraperEngine:
         return
     
 
-    def run_scraping(self, actor_df):
+    def run_scraping(self, actor_df, concurrency=None, rate=ASYNC_RATE):
         """
         Run the Wikipedia scraper on all actors in the dataset.
+
+        By default the pages are fetched one at a time, with a 1 to 3 s delay after each.
+        With `concurrency`, up to that many pages are fetched at once with aiohttp,
+        within the same politeness budget of `rate` requests per second to
+        Wikipedia (see `src.engines.async_scraping`).
+
+        Args:
+            actor_df (pd.DataFrame): Actors indexed by name, completed in place.
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to None (blocking mode).
+            rate (float): Requests per second of the async mode. Default is `ASYNC_RATE`.
         """
         actor_df.index = actor_df.index.map(self.cap_surnames)
 
@@ -325,6 +350,15 @@ class ActorScraperEngine:
         for col in new_columns:
             actor_df.loc[:, col] = None
 
+        if concurrency is not None:
+            if find_spec('aiohttp') is None:
+                raise ImportError("The async scraping mode requires aiohttp (pip install aiohttp).")
+            from .async_scraping import scrape_actors
+
+            results = scrape_actors(self, actor_df.index, concurrency, rate)
+            actor_df.loc[:, new_columns] = [[actor_data[col] for col in new_columns] for actor_data in results]
+            return
+
         # Main loop for scraping
         for idx, row in tqdm(actor_df.iterrows(), total=len(actor_df)):
             actor_name = row.name  # Adjust column name as per your dataset
@@ -338,5 +372,3 @@ class ActorScraperEngine:
             time.sleep(random.uniform(1, 3))
 
         return
-
-
@@ -1,3 +1,7 @@
 from .actor_success_model import actor_success_index
 from .movie_success_model import movie_success_index
-from .linear_regression import train_linear_regression, predict_success
\ No newline at end of file
+from .linear_regression import train_linear_regression, predict_success
+from .incremental_actor_score import IncrementalActorScores
+from .weight_sweep import weight_sweep, sweep_actor_scores
+from .incremental_regression import IncrementalLinearRegression
+from .resampling import resample_regression
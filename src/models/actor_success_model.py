@@ -1,5 +1,9 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+from src.data.column_store import NumericColumnStore
 
 def multiplier_generator(group, mul_factor=0.15, penalty_threshold=-0.25):
     """
@@ -41,13 +45,157 @@ def multiplier_generator(group, mul_factor=0.15, penalty_threshold=-0.25):
     cumulative_score = np.log(sum(multiplied_scores) / len(multiplied_scores))
     return pd.Series({'Cumulative Score': cumulative_score})
 
-def actor_success_index(character_movie_df):
+def segment_cumulative_scores(scores, starts, mul_factor=0.15, penalty_threshold=-0.25):
+    """
+    Vectorized version of `multiplier_generator` over many actors at once.
+
+    The movie scores of all actors are stored back to back, each actor's movies
+    in chronological order. The penalty only depends on the previous score, so
+    every multiplier is computed at once; the cumulative log-multipliers and the
+    sums of multiplied scores are then accumulated per actor, stacking actors
+    with the same number of movies so that the accumulation order (and thus
+    the result) is exactly that of `multiplier_generator`.
+
+    Args:
+        scores (np.ndarray): Movie scores, with the lead role boost already applied.
+        starts (np.ndarray): Index in `scores` of the first movie of each actor.
+        mul_factor (float): Multiplier factor for movie success index. Default is 0.15.
+        penalty_threshold (float): Threshold for penalty based on score difference. Default is -0.25.
+
+    Returns:
+        np.ndarray: The 'Cumulative Score' of each actor.
+    """
+    _, score_sums = segment_score_states(scores, starts, mul_factor, penalty_threshold)
+    lengths = np.diff(np.append(starts, len(scores)))
+    return np.log(score_sums / lengths)
+
+
+def segment_score_states(scores, starts, mul_factor=0.15, penalty_threshold=-0.25):
+    """
+    Calculates, for each actor, the state of `multiplier_generator` after their
+    last movie: the cumulative log-multiplier and the sum of multiplied scores.
+    See `segment_cumulative_scores` for the arguments. `scores` may also have
+    one column per scoring of the movies, giving one column of states per scoring.
+
+    Returns:
+        np.ndarray: The cumulative log-multiplier of each actor.
+        np.ndarray: The sum of multiplied scores of each actor.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, len(scores)))
+
+    # Define the multiplier proportional to the movie score
+    multipliers = 1 + (scores / 10) * mul_factor
+
+    # Penalize drops from the previous movie of the same actor
+    previous = np.roll(scores, 1, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score_diff_pct = (scores - previous) / previous
+    penalized = score_diff_pct < penalty_threshold
+    penalized[starts] = False
+    multipliers[penalized] *= 1 + score_diff_pct[penalized]
+
+    log_multipliers = np.log(multipliers)
+
+    cumulative_log_multipliers = np.empty((len(starts),) + scores.shape[1:])
+    score_sums = np.empty((len(starts),) + scores.shape[1:])
+    for length in np.unique(lengths):
+        actors = np.flatnonzero(lengths == length)
+        rows = starts[actors, None] + np.arange(length)
+
+        cumulative_log = np.cumsum(log_multipliers[rows], axis=1)
+        multiplied_scores = scores[rows] * np.exp(cumulative_log)
+        cumulative_log_multipliers[actors] = cumulative_log[:, -1]
+        score_sums[actors] = np.cumsum(multiplied_scores, axis=1)[:, -1]
+
+    return cumulative_log_multipliers, score_sums
+
+
+def score_shard(store, starts, lengths, mul_factor, penalty_threshold):
+    """
+    Calculates the cumulative scores of a shard of actors, reading their movie
+    scores from the shared column store.
+    """
+    if len(starts) == 0:
+        return np.empty(0)
+
+    # Gather the shard's movies back to back
+    shard_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    rows = np.repeat(starts - shard_starts, lengths) + np.arange(lengths.sum())
+    return segment_cumulative_scores(store.column('score')[rows], shard_starts, mul_factor, penalty_threshold)
+
+
+def parallel_segment_cumulative_scores(scores, starts, actor_names, n_jobs, mul_factor=0.15, penalty_threshold=-0.25):
+    """
+    Calculates the cumulative scores like `segment_cumulative_scores`, with the
+    actors hash-partitioned into `n_jobs` shards scored in worker processes.
+
+    The movie scores are written once to a memory-mapped column store that the
+    workers read, so only the shards' offsets are sent to the workers. Each
+    actor is scored independently, so the result doesn't depend on `n_jobs`.
+
+    Args:
+        scores (np.ndarray): Movie scores, with the lead role boost already applied.
+        starts (np.ndarray): Index in `scores` of the first movie of each actor.
+        actor_names (np.ndarray): Name of each actor, used to assign the shards.
+        n_jobs (int): Number of worker processes.
+
+    Returns:
+        np.ndarray: The 'Cumulative Score' of each actor.
+    """
+    lengths = np.diff(np.append(starts, len(scores)))
+    shards = pd.util.hash_array(np.asarray(actor_names, dtype=object)) % n_jobs
+    cumulative_scores = np.empty(len(starts))
+
+    with tempfile.TemporaryDirectory() as path:
+        store = NumericColumnStore.write(path, pd.DataFrame({'score': scores}), ['score'])
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            actors = [np.flatnonzero(shards == shard) for shard in range(n_jobs)]
+            results = executor.map(score_shard, [store] * n_jobs, [starts[a] for a in actors],
+                                   [lengths[a] for a in actors], [mul_factor] * n_jobs, [penalty_threshold] * n_jobs)
+            for shard_actors, shard_scores in zip(actors, results):
+                cumulative_scores[shard_actors] = shard_scores
+
+    return cumulative_scores
+
+
+def actor_cumulative_scores(character_movie_df, mul_factor=0.15, penalty_threshold=-0.25, n_jobs=1):
+    """
+    Calculates the 'Cumulative Score' of each actor, like applying `multiplier_generator`
+    to each actor group.
+
+    Args:
+        character_movie_df (pd.DataFrame): Movie data sorted by actor and release date.
+        mul_factor (float): Multiplier factor for movie success index. Default is 0.15.
+        penalty_threshold (float): Threshold for penalty based on score difference. Default is -0.25.
+        n_jobs (int): Number of worker processes. Default is 1 (no worker process).
+
+    Returns:
+        np.ndarray: The cumulative scores, in the sorted order of the actor names.
+    """
+    character_movie_df = character_movie_df.dropna(subset=['Actor name'])
+    actor_names = character_movie_df['Actor name'].to_numpy()
+    starts = np.flatnonzero(np.append(True, actor_names[1:] != actor_names[:-1]))
+
+    # Boost the score of the movies where the actor has the lead role
+    success_index = character_movie_df['Movie Success Index'].to_numpy(dtype=np.float64)
+    lead_role = character_movie_df['Movie star'].to_numpy() == actor_names
+    scores = np.where(lead_role, 1.25 * success_index, success_index)
+
+    if n_jobs > 1:
+        return parallel_segment_cumulative_scores(scores, starts, actor_names[starts], n_jobs, mul_factor, penalty_threshold)
+    return segment_cumulative_scores(scores, starts, mul_factor, penalty_threshold)
+
+
+def actor_success_index(character_movie_df, n_jobs=1):
     """
     Calculates the cumulative success score for each actor based on their movies' 
     'Movie Success Index', sorted by actor and release date.
 
     Args:
         character_movie_df (pd.DataFrame): DataFrame with movie and actor data.
+        n_jobs (int): Number of worker processes for the cumulative scores. Default is 1.
 
     Returns:
         pd.DataFrame: DataFrame of actors with their cumulative success scores, sorted by score.
@@ -55,9 +203,7 @@ def actor_success_index(character_movie_df):
     character_movie_df.sort_values(by=['Actor name', 'Movie release date_x'], inplace=True)
 
     actor_data = character_movie_df.groupby('Actor name').first().reset_index()
-    cumulative_scores = character_movie_df.groupby('Actor name').apply(multiplier_generator).reset_index(drop=True)
-
-    actor_data['Cumulative Score'] = cumulative_scores['Cumulative Score']
+    actor_data['Cumulative Score'] = actor_cumulative_scores(character_movie_df, n_jobs=n_jobs)
     
     actor_data.sort_values('Cumulative Score', ascending=False, inplace=True)
     actor_data['Actor Score Index'] = 10 * (
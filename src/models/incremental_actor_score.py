@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+from .actor_success_model import segment_score_states
+
+
+class IncrementalActorScores:
+    """
+    Keeps the cumulative score of every actor up to date as new movies arrive,
+    without re-scoring the actors that are not in the new batch.
+
+    For each actor the state of `multiplier_generator` is kept: the running
+    log-multiplier, the previous movie score, the sum of multiplied scores and
+    the number of movies. Movies released after an actor's last movie are
+    appended to this state; a movie inserted before it triggers a replay of
+    that actor's movies only. The minimum and maximum cumulative scores used
+    for the 0-10 'Actor Score Index' are maintained along the way.
+
+    Scores are identical to `actor_success_index` on all the rows seen so far,
+    in the order they were added: movies released the same day are ordered by
+    their row number in that concatenation, like the stable sort of the batch
+    computation. Updating a batch only writes the rows of its actors in the state.
+    """
+
+    def __init__(self, mul_factor=0.15, penalty_threshold=-0.25):
+        self.mul_factor = mul_factor
+        self.penalty_threshold = penalty_threshold
+        self.state = pd.DataFrame(columns=['Log Multiplier', 'Previous Score', 'Score Sum', 'Movie Count',
+                                           'Last Release', 'Cumulative Score'])
+        # Release dates, scores and row numbers of the movies of each actor, in chronological order
+        self.history = {}
+        # Number of rows added so far, the row number of the next row
+        self.n_rows = 0
+        self.min_score = np.inf
+        self.max_score = -np.inf
+
+    @classmethod
+    def from_frame(cls, character_movie_df, mul_factor=0.15, penalty_threshold=-0.25):
+        """
+        Builds the state of all the actors of a character-movie DataFrame, as
+        returned by `actor_data`.
+        """
+        scorer = cls(mul_factor, penalty_threshold)
+        rows = scorer._prepare(character_movie_df)
+        actor_names = rows['Actor name'].to_numpy()
+        starts = np.flatnonzero(np.append(True, actor_names[1:] != actor_names[:-1]))
+        scores = rows['Score'].to_numpy()
+        releases = rows['Movie release date_x'].to_numpy()
+        row_numbers = rows['Row'].to_numpy()
+
+        log_multipliers, score_sums = segment_score_states(scores, starts, mul_factor, penalty_threshold)
+        ends = np.append(starts[1:], len(rows))
+        lengths = ends - starts
+
+        scorer.state = pd.DataFrame({
+            'Log Multiplier': log_multipliers,
+            'Previous Score': scores[ends - 1],
+            'Score Sum': score_sums,
+            'Movie Count': lengths,
+            'Last Release': releases[ends - 1],
+            'Cumulative Score': np.log(score_sums / lengths)
+        }, index=pd.Index(actor_names[starts], name='Actor name'))
+        scorer.history = {name: (list(releases[start:end]), list(scores[start:end]), list(row_numbers[start:end]))
+                          for name, start, end in zip(actor_names[starts], starts, ends)}
+        scorer._update_bounds(scorer.state['Cumulative Score'])
+        return scorer
+
+    def update_actor_scores(self, new_rows):
+        """
+        Adds new actor-movie rows and updates the scores of the affected actors.
+
+        Args:
+            new_rows (pd.DataFrame): New rows with the 'Actor name', 'Movie release date_x',
+                'Movie star' and 'Movie Success Index' columns.
+
+        Returns:
+            pd.Series: The updated 'Cumulative Score' of the affected actors.
+        """
+        rows = self._prepare(new_rows)
+        updated = {}
+
+        for name, group in rows.groupby('Actor name', sort=False):
+            releases = list(group['Movie release date_x'])
+            scores = list(group['Score'])
+            row_numbers = list(group['Row'])
+
+            if name not in self.history:
+                self.history[name] = ([], [], [])
+                state = self._empty_state()
+            elif release_key(releases[0], row_numbers[0]) < release_key(*self._last_movie(name)):
+                # Inserted before the last movie: replay the actor's movies in order
+                updated[name] = self._replay(name, releases, scores, row_numbers)
+                continue
+            else:
+                state = self.state.loc[name].to_dict()
+
+            for release, score in zip(releases, scores):
+                state = self._step(state, score, release)
+            for movies, new_movies in zip(self.history[name], (releases, scores, row_numbers)):
+                movies.extend(new_movies)
+            updated[name] = state
+
+        if not updated:
+            return pd.Series(dtype=np.float64, name='Cumulative Score')
+
+        updated = pd.DataFrame.from_dict(updated, orient='index')[self.state.columns]
+        updated.index.name = 'Actor name'
+        known = updated.index.isin(self.state.index)
+        previous_scores = self.state['Cumulative Score'].reindex(updated.index[known])
+
+        # Only the rows of the updated actors are written, the new actors are appended
+        self.state.loc[updated.index[known]] = updated[known]
+        if not known.all():
+            new_actors = updated[~known]
+            self.state = pd.concat([self.state, new_actors]) if len(self.state) else new_actors
+
+        # An actor that held the minimum or the maximum may no longer hold it
+        if previous_scores.isin([self.min_score, self.max_score]).any():
+            self.min_score, self.max_score = np.inf, -np.inf
+            self._update_bounds(self.state['Cumulative Score'])
+        else:
+            self._update_bounds(updated['Cumulative Score'])
+
+        return updated['Cumulative Score'].rename('Cumulative Score')
+
+    def score_index(self, actors=None):
+        """
+        Returns the 'Actor Score Index' (cumulative scores rescaled on a 0-10 scale).
+
+        Args:
+            actors (list, optional): Actors to return. Defaults to all actors.
+
+        Returns:
+            pd.Series: The score index of the actors, sorted by score.
+        """
+        cumulative_scores = self.state['Cumulative Score']
+        if actors is not None:
+            cumulative_scores = cumulative_scores.loc[actors]
+        index = 10 * (cumulative_scores - self.min_score) / (self.max_score - self.min_score)
+        return index.astype(np.float64).sort_values(ascending=False).rename('Actor Score Index')
+
+    def _prepare(self, character_movie_df):
+        """
+        Returns the rows sorted by actor and release date, with the lead role boost applied.
+        """
+        # Row numbers in the concatenation of all the rows added, the tie-break of equal release dates
+        row_numbers = self.n_rows + np.arange(len(character_movie_df))
+        self.n_rows += len(character_movie_df)
+
+        rows = character_movie_df.assign(Row=row_numbers).dropna(subset=['Actor name'])
+        rows = rows.sort_values(by=['Actor name', 'Movie release date_x', 'Row'])
+        success_index = rows['Movie Success Index'].to_numpy(dtype=np.float64)
+        lead_role = rows['Movie star'].to_numpy() == rows['Actor name'].to_numpy()
+        return pd.DataFrame({
+            'Actor name': rows['Actor name'].to_numpy(),
+            'Movie release date_x': rows['Movie release date_x'].to_numpy(),
+            'Score': np.where(lead_role, 1.25 * success_index, success_index),
+            'Row': rows['Row'].to_numpy()
+        })
+
+    def _empty_state(self):
+        return {'Log Multiplier': 0.0, 'Previous Score': None, 'Score Sum': 0.0, 'Movie Count': 0,
+                'Last Release': None, 'Cumulative Score': np.nan}
+
+    def _step(self, state, score, release):
+        """
+        Adds one movie to an actor's state, like one iteration of `multiplier_generator`.
+        """
+        multiplier = 1 + (score / 10) * self.mul_factor
+
+        if state['Movie Count'] > 0:
+            prev_score = state['Previous Score']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                score_diff_pct = np.float64(score - prev_score) / prev_score
+            if score_diff_pct < self.penalty_threshold:
+                multiplier *= 1 + score_diff_pct
+
+        log_multiplier = state['Log Multiplier'] + np.log(multiplier)
+        score_sum = state['Score Sum'] + score * np.exp(log_multiplier)
+        count = state['Movie Count'] + 1
+        return {'Log Multiplier': log_multiplier, 'Previous Score': score, 'Score Sum': score_sum,
+                'Movie Count': count, 'Last Release': release, 'Cumulative Score': np.log(score_sum / count)}
+
+    def _replay(self, name, releases, scores, row_numbers):
+        """
+        Merges new movies into an actor's history and recomputes their state.
+        """
+        old_releases, old_scores, old_row_numbers = self.history[name]
+        merged = sorted(zip(old_releases + releases, old_scores + scores, old_row_numbers + row_numbers),
+                        key=lambda movie: release_key(movie[0], movie[2]))
+        self.history[name] = tuple(map(list, zip(*merged)))
+
+        state = self._empty_state()
+        for release, score, _ in merged:
+            state = self._step(state, score, release)
+        return state
+
+    def _last_movie(self, name):
+        releases, _, row_numbers = self.history[name]
+        return releases[-1], row_numbers[-1]
+
+    def _update_bounds(self, cumulative_scores):
+        if len(cumulative_scores):
+            self.min_score = min(self.min_score, cumulative_scores.min())
+            self.max_score = max(self.max_score, cumulative_scores.max())
+
+
+def release_key(release, row_number):
+    """
+    Sort key of a movie: its release date, with missing dates last as in
+    `sort_values`, then its row number for movies released the same day.
+    """
+    return (1, '', row_number) if pd.isna(release) else (0, release, row_number)
@@ -0,0 +1,193 @@
+import numpy as np
+from scipy.sparse import csr_matrix, hstack, issparse
+
+from src.data.encoding import CategoricalEncoder
+from .linear_regression import CATEGORICAL_COLUMNS, TARGET_COLUMN, numeric_features, regression_rows
+
+
+def solve_least_squares(n_rows, sum_x, sum_y, xtx, xty, rcond=1e-10):
+    """
+    Solves a linear regression with intercept from its sufficient statistics.
+
+    The statistics are centered and the coefficients are the minimum-norm
+    solution given by the pseudo-inverse of the centered XᵀX, as `LinearRegression`.
+    Weighted rows (e.g. bootstrap counts) are supported by weighting the statistics.
+
+    Args:
+        n_rows (float): Number (or total weight) of the rows.
+        sum_x (np.ndarray): Sum of each feature.
+        sum_y (float): Sum of the target.
+        xtx (np.ndarray): XᵀX.
+        xty (np.ndarray): Xᵀy.
+        rcond (float): Eigenvalues of the centered XᵀX below rcond times the largest are treated as 0.
+
+    Returns:
+        np.ndarray: The coefficients.
+        float: The intercept.
+    """
+    mean_x = sum_x / n_rows
+    mean_y = sum_y / n_rows
+    centered_xtx = xtx - n_rows * np.outer(mean_x, mean_x)
+    centered_xty = xty - n_rows * mean_x * mean_y
+
+    coefficients = np.linalg.pinv(centered_xtx, rcond=rcond, hermitian=True) @ centered_xty
+    return coefficients, mean_y - mean_x @ coefficients
+
+
+class IncrementalLinearRegression:
+    """
+    Linear regression of the actors' success score updated from batches of actors.
+
+    Only the sufficient statistics of the fit are kept: the number of rows, the
+    sums of the features and of the target, XᵀX, Xᵀy and the number of rows of
+    each category. Adding or removing k rows costs O(k·p²) for p features, and
+    solving the coefficients O(p³), independently of the number of rows seen.
+
+    The coefficients are those of `LinearRegression` fitted on the current rows
+    (the minimum-norm solution of the centered least squares), with the features
+    in the order of `regression_data`. After `solve`, `coef_`, `intercept_` and
+    `feature_names_in_` are set like on a fitted `LinearRegression`, so the model
+    can be used with `predict_success` and `save_regression_artifact`.
+    """
+
+    def __init__(self, rcond=1e-10):
+        # See `solve_least_squares`
+        self.rcond = rcond
+        self.numeric_features = None
+        # The categories keep their column as new ones are added, after the numeric features
+        self.encoder = CategoricalEncoder(CATEGORICAL_COLUMNS, handle_unknown='error')
+        self.n_rows = 0
+        self.sum_x = np.zeros(0)
+        self.sum_y = 0.0
+        self.xtx = np.zeros((0, 0))
+        self.xty = np.zeros(0)
+        # Number of rows of each category, 0 for the numeric features
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def partial_fit(self, df):
+        """
+        Adds actors to the fit.
+
+        Args:
+            df (pd.DataFrame): Actor data, as returned by `load_actor_data_for_analysis`.
+
+        Returns:
+            IncrementalLinearRegression: The model, with its coefficients solved.
+        """
+        X, y = self._design(regression_rows(df), extend=True)
+        self._update(X, y, 1)
+        return self.solve()
+
+    def remove(self, df):
+        """
+        Removes actors previously added with `partial_fit` from the fit.
+
+        Args:
+            df (pd.DataFrame): The actor rows to remove.
+
+        Returns:
+            IncrementalLinearRegression: The model, with its coefficients solved.
+        """
+        X, y = self._design(regression_rows(df), extend=False)
+        n_numeric = len(self.numeric_features)
+        if len(y) > self.n_rows or (np.asarray(X[:, n_numeric:].sum(axis=0)).ravel() > self.counts[n_numeric:]).any():
+            raise ValueError('Cannot remove actors that were not added.')
+        self._update(X, y, -1)
+        return self.solve()
+
+    def fit_chunks(self, chunks):
+        """
+        Adds actors from an iterator of DataFrames, e.g.
+        `load_actor_data_for_analysis(chunksize=1000)`, solving once at the end.
+        """
+        for chunk in chunks:
+            X, y = self._design(regression_rows(chunk), extend=True)
+            self._update(X, y, 1)
+        return self.solve()
+
+    def solve(self):
+        """
+        Solves the coefficients from the sufficient statistics.
+
+        Categories with no row left are dropped from the features, as they would
+        be by `pd.get_dummies`.
+
+        Returns:
+            IncrementalLinearRegression: The model.
+        """
+        if self.n_rows == 0:
+            raise ValueError('Cannot solve a regression with no rows.')
+
+        features, positions = self.features()
+        self.coef_, self.intercept_ = solve_least_squares(
+            self.n_rows, self.sum_x[positions], self.sum_y, self.xtx[np.ix_(positions, positions)],
+            self.xty[positions], self.rcond)
+        self.feature_names_in_ = np.array(features, dtype=object)
+        return self
+
+    def features(self):
+        """
+        Returns the features in the order of `regression_data` (numeric features then
+        the sorted categories of each categorical column) and their column in the statistics.
+        """
+        n_numeric = len(self.numeric_features)
+        features = list(self.numeric_features)
+        positions = list(range(n_numeric))
+        for column, categories in self.categories.items():
+            for category in categories:
+                features.append(f'{column}_{category}')
+                positions.append(n_numeric + self.encoder.positions[column][category])
+        return features, np.array(positions, dtype=np.int64)
+
+    @property
+    def categories(self):
+        """
+        The sorted categories of each categorical column with at least one row, as
+        expected by `save_regression_artifact`.
+        """
+        n_numeric = len(self.numeric_features)
+        return {column: sorted(category for category, position in positions.items()
+                               if self.counts[n_numeric + position] > 0)
+                for column, positions in self.encoder.positions.items()}
+
+    def predict(self, X):
+        if not issparse(X):
+            X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef_ + self.intercept_
+
+    def _design(self, rows, extend):
+        """
+        Encodes actor rows with the columns of the statistics, adding the columns
+        of new categories when `extend` is True.
+        """
+        if self.numeric_features is None:
+            self.numeric_features = numeric_features(rows)
+            self._grow(len(self.numeric_features))
+
+        if extend:
+            n_categories = self.encoder.n_features
+            self.encoder.partial_fit(rows)
+            self._grow(self.encoder.n_features - n_categories)
+
+        X = hstack([csr_matrix(rows[self.numeric_features].to_numpy(dtype=np.float64)), self.encoder.transform(rows)],
+                   format='csr')
+        return X, rows[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+    def _update(self, X, y, sign):
+        n_numeric = len(self.numeric_features)
+        column_sums = np.asarray(X.sum(axis=0)).ravel()
+        self.n_rows += sign * len(y)
+        self.sum_x += sign * column_sums
+        self.sum_y += sign * y.sum()
+        self.xtx += sign * (X.T @ X).toarray()
+        self.xty += sign * (X.T @ y)
+        self.counts[n_numeric:] += sign * column_sums[n_numeric:].astype(np.int64)
+
+    def _grow(self, n_columns):
+        """
+        Adds columns with no data to the statistics.
+        """
+        self.sum_x = np.pad(self.sum_x, (0, n_columns))
+        self.xtx = np.pad(self.xtx, ((0, n_columns), (0, n_columns)))
+        self.xty = np.pad(self.xty, (0, n_columns))
+        self.counts = np.pad(self.counts, (0, n_columns))
@@ -1,31 +1,96 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
+from scipy.sparse import csr_matrix, hstack
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 from src.data.correlation import ethnicity_to_group
 from src.data import load_actor_data_for_analysis
+from src.data.encoding import CategoricalEncoder
+
+MODEL_PATH = 'data/models/success_regression.json'
+
+CATEGORICAL_COLUMNS = ['Gender', 'Birth Region', 'Ethnicity', 'Sports', 'Birth Month']
+DROPPED_COLUMNS = ['Actor name', 'Usable Uni Rank', 'Citizenship', 'QS University Rank', 'Birth City', 'University']
+TARGET_COLUMN = 'Success Score'
+
+# Tolerance of the sparse least squares solver of LinearRegression
+SPARSE_TOL = 1e-14
+
+# Design matrix of the regression (numeric features then one-hot categories), target, feature names and encoder
+RegressionData = namedtuple('RegressionData', ['X', 'y', 'features', 'encoder'])
+
+
+def regression_rows(df):
+    """
+    Groups the ethnicities, drops the columns unused by the regression and the
+    rows with missing values. Missing categories are kept, as all-zero one-hot columns.
 
+    Args:
+        df (pd.DataFrame): Actor data, as returned by `load_actor_data_for_analysis`.
 
-def train_linear_regression():
-    # Load data
-    df = load_actor_data_for_analysis()
-    df = ethnicity_to_group(df)
-    df = df.drop(['Actor name', 'Usable Uni Rank', 'Citizenship', 'QS University Rank', 'Birth City', 'University',], axis=1)
+    Returns:
+        pd.DataFrame: The actor rows used by the regression.
+    """
+    df = ethnicity_to_group(df.copy())
+    # 'Actor name' is the index of `load_actor_data_for_analysis`
+    df = df.drop(DROPPED_COLUMNS, axis=1, errors='ignore')
+    return df.dropna(subset=[column for column in df.columns if column not in CATEGORICAL_COLUMNS])
 
 
+def numeric_features(rows):
+    """
+    Returns the columns of regression rows that are used as they are.
+    """
+    return [column for column in rows.columns if column not in CATEGORICAL_COLUMNS and column != TARGET_COLUMN]
+
+
+def regression_data(df=None):
+    """
+    Prepares the actor data for the regression (see `regression_rows`) and one-hot
+    encodes the categorical columns with a `CategoricalEncoder`.
+
+    Args:
+        df (pd.DataFrame, optional): Actor data. Defaults to `load_actor_data_for_analysis()`.
+
+    Returns:
+        RegressionData: The sparse design matrix, the 'Success Score' of each actor, the
+            names of the features (in the order of `pd.get_dummies`) and the fitted encoder.
+    """
+    rows = regression_rows(load_actor_data_for_analysis() if df is None else df)
+    numeric = numeric_features(rows)
+
     # One-hot encode categorical variables
-    df = pd.get_dummies(df,columns = ['Gender', 'Birth Region', 'Ethnicity', 'Sports', 'Birth Month'])
-    df.dropna(inplace=True)
+    encoder = CategoricalEncoder(CATEGORICAL_COLUMNS).fit(rows)
+    X = hstack([csr_matrix(rows[numeric].to_numpy(dtype=np.float64)), encoder.transform(rows)], format='csr')
+
+    return RegressionData(X, rows[TARGET_COLUMN], numeric + encoder.feature_names, encoder)
 
-    # Define features and target variable
-    X = df.drop(columns=['Success Score'])
-    y = df['Success Score']
+
+def train_linear_regression(artifact_path=MODEL_PATH):
+    """
+    Trains the linear regression of the actors' success score and saves it as
+    an artifact for `predict_success` (see `save_regression_artifact`).
+
+    Args:
+        artifact_path (str, optional): Path of the saved artifact. Defaults to `MODEL_PATH`.
+
+    Returns:
+        LinearRegression: The trained model.
+    """
+    data = regression_data()
 
     # Split the data into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(data.X, data.y, test_size=0.2, random_state=42)
 
-    # Create and train the linear regression model
-    model = LinearRegression()
+    # Create and train the linear regression model on the sparse matrix. Its solver
+    # is iterative (lsqr): the tolerance makes it converge to the exact least squares.
+    model = LinearRegression(tol=SPARSE_TOL)
     model.fit(X_train, y_train)
 
     # Make predictions
@@ -38,36 +103,103 @@ def train_linear_regression():
     print(f'Mean Squared Error: {mse}')
     print(f'R^2: {r2}')
 
+    save_regression_artifact(model, data.features, data.encoder.categories, artifact_path,
+                             metrics={'mse': mse, 'r2': r2})
     return model
 
 
-def predict_success(model, new_data):
-    df = pd.read_csv('actor_data_for_regression.csv')
-    df = ethnicity_to_group(df)
-    df = df.drop(['Actor name', 'Usable Uni Rank', 'Citizenship', 'QS University Rank', 'Birth City', 'University', ],
-                 axis=1)
-
-    # One-hot encode categorical variables
-    df = pd.get_dummies(df, columns=['Gender', 'Birth Region', 'Ethnicity', 'Sports', 'Birth Month'])
-    df.dropna(inplace=True)
-
-    # Define features and target variable
-    X = df.drop(columns=['Success Score'])
-    y = df['Success Score']
-
-    # Split the data into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    # Convert new data to DataFrame
-    new_df = pd.DataFrame(new_data)
-
-    # Encode new data
-    new_df = pd.get_dummies(new_df, columns=['Gender', 'Birth Region', 'Ethnicity', 'Sports', 'Birth Month'])
-
-    # Align new data with training data columns
-
-    new_df = new_df.reindex(columns=X_train.columns, fill_value=0)
-
-    # Make prediction
-    new_prediction = model.predict(new_df)
-    return new_prediction
\ No newline at end of file
+def save_regression_artifact(model, features, categories, path=MODEL_PATH, metrics=None):
+    """
+    Saves a trained model as JSON: its coefficients and intercept, the exact
+    order of its features and the categories of each one-hot encoded column.
+
+    Args:
+        model (LinearRegression): Model fitted on the features of `regression_data`.
+        features (list): Names of the features of the model.
+        categories (dict): The categories of each categorical column, see `CategoricalEncoder`.
+        path (str, optional): Path of the artifact. Defaults to `MODEL_PATH`.
+        metrics (dict, optional): Evaluation metrics stored along the model.
+    """
+    one_hot_features = CategoricalEncoder.from_categories(categories).feature_names
+
+    artifact = {
+        'features': list(features),
+        'numeric_features': [feature for feature in features if feature not in one_hot_features],
+        'categories': categories,
+        'coefficients': np.asarray(model.coef_).tolist(),
+        'intercept': float(model.intercept_),
+        'metrics': metrics or {}
+    }
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(artifact, f, indent=1)
+
+
+def load_regression_artifact(path=MODEL_PATH):
+    """
+    Loads a saved model, only reading the file again when it changed.
+
+    Returns:
+        dict: The artifact, with the coefficients as an array and the `CategoricalEncoder`
+            of its categories in 'encoder'.
+    """
+    return _load_regression_artifact(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _load_regression_artifact(path, mtime_ns):
+    with open(path) as f:
+        artifact = json.load(f)
+
+    artifact['coefficients'] = np.asarray(artifact['coefficients'], dtype=np.float64)
+    artifact['encoder'] = CategoricalEncoder.from_categories(artifact['categories'])
+    if artifact['features'] != artifact['numeric_features'] + artifact['encoder'].feature_names:
+        raise ValueError(f"The features of the artifact '{path}' are not the numeric features followed by the categories.")
+    return artifact
+
+
+def design_matrix(new_df, artifact):
+    """
+    Encodes actor data with the features of a saved model. Missing features are
+    set to 0, as are the one-hot columns of unknown categories.
+
+    Args:
+        new_df (pd.DataFrame): Actor data, with the categorical columns not encoded.
+        artifact (dict): The model, as returned by `load_regression_artifact`.
+
+    Returns:
+        csr_matrix: The features, of shape (len(new_df), number of features).
+    """
+    numeric = new_df.reindex(columns=artifact['numeric_features'], fill_value=0).to_numpy(dtype=np.float64)
+    encoder = artifact['encoder']
+    one_hot = encoder.transform(new_df.reindex(columns=encoder.columns))
+    return hstack([csr_matrix(numeric), one_hot], format='csr')
+
+
+def predict_success(model, new_data, artifact_path=MODEL_PATH):
+    """
+    Predicts the success score of new actors with a saved model.
+
+    The encoding of the features is read from the artifact saved by
+    `train_linear_regression`, loaded once, and all actors are scored with a
+    single matrix product.
+
+    Args:
+        model (LinearRegression): Model returned by `train_linear_regression`, or None to
+            use the coefficients of the artifact.
+        new_data (dict or pd.DataFrame): Features of the new actors, one value per actor.
+        artifact_path (str, optional): Path of the artifact. Defaults to `MODEL_PATH`.
+
+    Returns:
+        np.ndarray: The predicted success score of each actor.
+    """
+    artifact = load_regression_artifact(artifact_path)
+    coefficients, intercept = artifact['coefficients'], artifact['intercept']
+    if model is not None:
+        if len(model.coef_) != len(artifact['features']):
+            raise ValueError(f"The model's features differ from those of the artifact '{artifact_path}'.")
+        coefficients, intercept = model.coef_, model.intercept_
+
+    X = design_matrix(pd.DataFrame(new_data), artifact)
+    return X @ coefficients + intercept
@@ -1,112 +1,201 @@
 import numpy as np
+import pandas as pd
+from src.data.column_store import NumericColumnStore
 
+# Chosen weights
+PROFITABILITY_WEIGHT = 0.35
+REVENUE_WEIGHT = 0.35
+REVIEW_WEIGHT = 0.3
+# Maximum increase of the success index from Oscar nominations
+OSCAR_WEIGHT = 0.25
 
-def profitability_factor(df):
-    """
-    Calculates the profitability factor for each movie in the DataFrame.
+# Columns computed on the way to the success index, only added to the DataFrame on request
+INTERMEDIATE_COLUMNS = ['Profitability', 'Log Profitability', 'Profitability score',
+                        'Log Revenue', 'Revenue score', 'Oscar Multiplication Factor']
 
-    This function computes a 'Profitability' column as the ratio of movie 
-    box office revenue to budget. It then applies a logarithmic transformation 
-    to reduce the influence of outliers and normalizes the result on a 0-10 scale 
-    to produce a 'Profitability Score'.
+# Key of the normalization bounds of the success index in `DataFrame.attrs`
+BOUNDS_ATTR = 'Movie Success Index bounds'
 
-    Returns:
-        None: Modifies the global DataFrame `df` in place by adding the column:
-            - 'Profitability Score': Normalized score on a 0-10 scale.
-    """
 
-    df['Profitability'] = df['Movie box office revenue'] / df['Movie budget']
+def nan_range(values):
+    """
+    Returns the minimum and maximum of the values, ignoring missing values.
+    """
+    return float(np.nanmin(values)), float(np.nanmax(values))
 
-    # Apply log to diminish the influence of high values
-    df['Log Profitability'] = df['Profitability'].apply(np.log)
 
-    # Normalize the log values to a 0-10 scale
-    df['Profitability score'] = 10 * (df['Log Profitability'] - df['Log Profitability'].min()) / (
-                                           df['Log Profitability'].max() - df['Log Profitability'].min())
-    return 
+def scale_to_10(values, out, bounds=None):
+    """
+    Normalizes values on a 0-10 scale, ignoring missing values for the minimum and maximum.
+    `out` may be `values` itself. `bounds` replaces the minimum and maximum of the values.
+    """
+    low, high = nan_range(values) if bounds is None else bounds
+    np.subtract(values, low, out=out)
+    out *= 10
+    out /= high - low
+    return out
 
 
-def revenue_factor(df):
+def log_nominations(nominations, out):
+    """
+    Calculates the log of the number of Oscar nominations plus one, 0 for movies with no nominations.
     """
-    Calculates the revenue factor for each movie in the DataFrame.
+    np.add(nominations, 1, out=out)
+    np.log(out, out=out)
+    out[np.isnan(nominations)] = 0
+    return out
 
-    This function computes a 'Revenue Score' based on the logarithmic 
-    transformation of the movie box office revenue. The score is normalized 
-    on a 0-10 scale to provide a relative measure of each movie's revenue.
+
+def success_index_arrays(revenue, budget, review, nominations, keep_intermediate=False, bounds=None):
+    """
+    Calculates the success index of each movie in a single pass over NumPy arrays.
+
+    - Profitability factor: the log of the revenue to budget ratio, to reduce the
+      influence of outliers, normalized on a 0-10 scale ('Profitability score').
+    - Revenue factor: the log of the box office revenue, normalized on a 0-10 scale
+      ('Revenue score').
+    - Review factor: the review score.
+    - Oscar factor: a multiplier between 1 and 1.25 growing with the log of the
+      number of nominations, 1 for movies with no nomination.
+
+    The factors are weighted (35%, 35% and 30%), multiplied by the Oscar factor
+    and normalized on a 0-10 scale by the maximum possible score. Each factor is
+    computed in place in a preallocated buffer; the input arrays are not modified.
+
+    The normalizations use the range of the movies, unless `bounds` gives it: a
+    subset of movies then gets the same intermediate values as in the full data.
+
+    Args:
+        revenue (np.ndarray): Movie box office revenue.
+        budget (np.ndarray): Movie budget.
+        review (np.ndarray): Review score.
+        nominations (np.ndarray): Number of Oscar nominations, NaN for none.
+        keep_intermediate (bool): Whether to return the intermediate values. Default is False.
+        bounds (dict, optional): The (minimum, maximum) of 'Log Profitability', 'Log Revenue',
+            'Number of nomination' and 'Oscar Multiplication Factor' to normalize with. The
+            bounds missing from the dict are computed from the movies and added to it.
 
     Returns:
-        None: Modifies the global DataFrame `df` in place by adding the column:
-            - 'Revenue Score': Normalized revenue score on a 0-10 scale.
+        np.ndarray: The 'Movie Success Index' of each movie.
+        dict: The intermediate values by column name (see `INTERMEDIATE_COLUMNS`),
+            empty unless `keep_intermediate` is True.
     """
+    n_movies = len(revenue)
+    if keep_intermediate:
+        out = {column: np.empty(n_movies) for column in INTERMEDIATE_COLUMNS}
+    else:
+        # The steps of each factor overwrite the same buffer
+        profitability, revenue_score = np.empty(n_movies), np.empty(n_movies)
+        out = {'Profitability': profitability, 'Log Profitability': profitability, 'Profitability score': profitability,
+               'Log Revenue': revenue_score, 'Revenue score': revenue_score,
+               'Oscar Multiplication Factor': np.empty(n_movies)}
+
+    bounds = {} if bounds is None else bounds
+
+    # Profitability factor, log to diminish the influence of high values
+    np.divide(revenue, budget, out=out['Profitability'])
+    np.log(out['Profitability'], out=out['Log Profitability'])
+    if 'Log Profitability' not in bounds:
+        bounds['Log Profitability'] = nan_range(out['Log Profitability'])
+    scale_to_10(out['Log Profitability'], out=out['Profitability score'], bounds=bounds['Log Profitability'])
+
+    # Revenue factor
+    np.add(revenue, 1, out=out['Log Revenue'])
+    np.log10(out['Log Revenue'], out=out['Log Revenue'])
+    if 'Log Revenue' not in bounds:
+        bounds['Log Revenue'] = nan_range(out['Log Revenue'])
+    scale_to_10(out['Log Revenue'], out=out['Revenue score'], bounds=bounds['Log Revenue'])
+
+    # Oscar factor, with a factor of 1 for movies with no nominations
+    if 'Number of nomination' not in bounds:
+        bounds['Number of nomination'] = nan_range(nominations)
+    oscar_factor = out['Oscar Multiplication Factor']
+    multiplier_weight = OSCAR_WEIGHT / np.log(bounds['Number of nomination'][1] + 1)
+    log_nominations(nominations, out=oscar_factor)
+    oscar_factor *= multiplier_weight
+    oscar_factor += 1
+    if 'Oscar Multiplication Factor' not in bounds:
+        bounds['Oscar Multiplication Factor'] = nan_range(oscar_factor)
 
-    df['Log Revenue'] = np.log10(df['Movie box office revenue'] + 1)
-    df['Revenue score'] = 10 * (df['Log Revenue'] - df['Log Revenue'].min())/(df['Log Revenue'].max() - df['Log Revenue'].min())
-    return 
+    max_possible_score = (
+        10 * PROFITABILITY_WEIGHT +
+        10 * REVENUE_WEIGHT +
+        10 * REVIEW_WEIGHT
+    ) * bounds['Oscar Multiplication Factor'][1]
 
+    success_index = np.multiply(out['Profitability score'], PROFITABILITY_WEIGHT)
+    weighted = np.multiply(out['Revenue score'], REVENUE_WEIGHT)
+    success_index += weighted
+    np.multiply(review, REVIEW_WEIGHT, out=weighted)
+    success_index += weighted
+    success_index *= oscar_factor
+    success_index /= max_possible_score
+    success_index *= 10
 
-def review_factor(df):
+    return success_index, out if keep_intermediate else {}
+
+
+def movie_input_arrays(df):
     """
-    Placeholder for the movie review score.
+    Returns the columns used by the success index, as float arrays.
+
+    `df` may also be a `NumericColumnStore` written with `write_movies`: the
+    float columns are then zero-copy views, in the order of the store's ids.
     """
-    return 
+    columns = ['Movie box office revenue', 'Movie budget', 'Review score', 'Number of nomination']
+    if isinstance(df, NumericColumnStore):
+        return [np.asarray(df.column(column), dtype=np.float64) for column in columns]
+    return [df[column].to_numpy(dtype=np.float64) for column in columns]
 
 
-def oscar_mult_factor(df):
+def success_index_components(df, bounds=None):
     """
-    Calculates an Oscar-nomination-based multiplication factor for each movie.
+    Calculates the intermediate columns of the success index without modifying the DataFrame.
 
-    Returns:
-        None: Modifies the global DataFrame `df` in place by adding the column:
-            - 'Oscar Multiplication Factor': Adjusted score based on Oscar nominations.
-    """
+    The normalization bounds are those stored by `movie_success_index` in the
+    attrs of the scored DataFrame, which are kept by its filtered views. A
+    subset of the scored movies thus gets the values of the full data.
 
-    multiplier_weight = 0.25/np.log(df['Number of nomination'].max()+1)
+    Args:
+        df (pd.DataFrame): Movie data, usually a subset of a DataFrame scored by `movie_success_index`.
+        bounds (dict, optional): Normalization bounds (see `success_index_arrays`). Defaults to
+            those stored in `df.attrs`, or to the range of the movies of `df`.
 
-    # Score of 0 for movies with no nominations
-    #df['Number of nomination'].fillna(0, inplace=True)
-    df.fillna({'Number of nomination': 0}, inplace=True)
-    df['Oscar Multiplication Factor'] = 1 + multiplier_weight * (np.log(df['Number of nomination'] +1))
-    
-    return 
+    Returns:
+        pd.DataFrame: The `INTERMEDIATE_COLUMNS` of each movie, with the index of `df`.
+    """
+    bounds = df.attrs.get(BOUNDS_ATTR) if bounds is None else bounds
+    _, intermediate = success_index_arrays(*movie_input_arrays(df), keep_intermediate=True,
+                                           bounds=dict(bounds or {}))
+    return pd.DataFrame(intermediate, index=df.index)
 
 
-def movie_success_index(df):
+def movie_success_index(df, keep_intermediate=False):
     """
     Calculates the success index of each movie.
 
-    This function combines the profitability factor, revenue factor, review 
-    factor, and Oscar-based multiplication factor to produce a final 'Movie Success 
-    Index'. Each component is weighted according to specified values. The resulting 
-    success index provides a normalized score on a 0-10 scale, indicating overall 
-    movie success.
+    This function combines the profitability factor, revenue factor, review
+    factor, and Oscar-based multiplication factor to produce a final 'Movie Success
+    Index' (see `success_index_arrays`). The resulting success index provides a
+    normalized score on a 0-10 scale, indicating overall movie success.
+
+    Args:
+        df (pd.DataFrame): Movie data with the revenue, budget, review score and number of nominations.
+        keep_intermediate (bool): Whether to also add the intermediate columns (e.g. 'Profitability score',
+            'Log Profitability') used by the plotting helpers. Default is False.
 
     Returns:
-        pd.DataFrame: The global DataFrame `df` with the following additional columns:
+        None: Modifies the DataFrame `df` in place by adding the column:
             - 'Movie Success Index': The final success index for each movie.
+            The normalization bounds are stored in `df.attrs[BOUNDS_ATTR]`, so that
+            `success_index_components` gives the same values on subsets of `df`.
     """
 
-    profitability_factor(df)
-    revenue_factor(df)
-    review_factor(df)
-    oscar_mult_factor(df)
+    bounds = {}
+    success_index, intermediate = success_index_arrays(*movie_input_arrays(df), keep_intermediate, bounds)
+    for column, values in intermediate.items():
+        df[column] = values
+    df['Movie Success Index'] = success_index
+    df.attrs[BOUNDS_ATTR] = bounds
 
-    # Chosen weights
-    profitability_weight = 0.35
-    revenue_weight = 0.35
-    review_weight = 0.3
-
-    max_possible_score = (
-        10 * profitability_weight +
-        10 * revenue_weight +
-        10 * review_weight
-    ) * df['Oscar Multiplication Factor'].max()
-
-    # Success index calculation
-    df['Movie Success Index'] = (
-        (df['Profitability score'] * profitability_weight +
-         df['Revenue score'] * revenue_weight +
-         df['Review score'] * review_weight) *
-         df['Oscar Multiplication Factor']
-    ) / max_possible_score *10
-
-    return 
+    return
@@ -0,0 +1,319 @@
+"""
+Local HTTP server of the actors' success predictions.
+
+The saved regression (see `train_linear_regression`) is loaded once at start-up.
+Concurrent requests are coalesced into micro-batches scored with a single
+matrix product. Run from the repository root:
+
+    python -m src.models.prediction_server --port 8050
+
+Endpoints:
+    POST /predict   JSON actor record, or list of records -> {"predictions": [...]}
+    GET  /stats     Request, batch and latency counters
+    GET  /health    {"status": "ok"}
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .linear_regression import MODEL_PATH, design_matrix, load_regression_artifact
+
+# Number of recent request latencies kept for the percentiles
+LATENCY_WINDOW = 10_000
+
+
+class ServerStats:
+    """
+    Thread-safe counters of the requests, batches and latencies of the server.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.actors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.latencies = deque(maxlen=window)
+
+    def record_request(self, n_actors, latency, error=False):
+        with self.lock:
+            self.requests += 1
+            self.errors += error
+            self.actors += n_actors
+            self.latencies.append(latency)
+
+    def record_batch(self, n_requests):
+        with self.lock:
+            self.batches += 1
+            self.batched_requests += n_requests
+
+    def snapshot(self):
+        """
+        Returns the counters, the throughput since start-up and the latency
+        percentiles (in milliseconds) of the recent requests.
+        """
+        with self.lock:
+            uptime = time.perf_counter() - self.started
+            latencies = np.array(self.latencies) * 1000
+            stats = {
+                'uptime_s': uptime,
+                'requests': self.requests,
+                'errors': self.errors,
+                'actors': self.actors,
+                'batches': self.batches,
+                'mean_batch_size': self.batched_requests / self.batches if self.batches else 0.0,
+                'requests_per_s': self.requests / uptime,
+                'actors_per_s': self.actors / uptime
+            }
+
+        for percentile in (50, 90, 99):
+            stats[f'latency_p{percentile}_ms'] = float(np.percentile(latencies, percentile)) if len(latencies) else 0.0
+        stats['latency_max_ms'] = float(latencies.max()) if len(latencies) else 0.0
+        return stats
+
+
+def records_frame(records, artifact):
+    """
+    Builds the actor data of JSON records with the features of a saved model.
+
+    Each record is read on its own, so that it is scored the same way alone or
+    in a batch: missing numeric features are set to 0, missing categories to
+    None, and the other keys are ignored.
+
+    Args:
+        records (list): Actor records, as dictionaries of feature values.
+        artifact (dict): The model, as returned by `load_regression_artifact`.
+
+    Returns:
+        pd.DataFrame: The numeric features and the categorical columns of the model.
+
+    Raises:
+        ValueError: If a numeric feature is not a finite number.
+    """
+    features = artifact['numeric_features']
+    numeric = np.array([[record.get(feature, 0) for feature in features] for record in records],
+                       dtype=np.float64).reshape(len(records), len(features))
+    invalid = ~np.isfinite(numeric)
+    if invalid.any():
+        row, column = np.argwhere(invalid)[0]
+        raise ValueError(f"'{features[column]}' must be a finite number, got {records[row][features[column]]!r}.")
+
+    df = pd.DataFrame(numeric, columns=features)
+    for column in artifact['encoder'].columns:
+        df[column] = pd.Series([record.get(column) for record in records], dtype=object)
+    return df
+
+
+class MicroBatcher:
+    """
+    Scores actor records in micro-batches on a single worker thread.
+
+    `submit` queues the records of a request and returns a Future. The worker
+    takes the first waiting request, then gathers the requests arriving within
+    `max_wait` seconds (up to `max_batch_size` actors), and scores them all
+    with one `design_matrix` and one matrix product.
+    """
+
+    def __init__(self, artifact, max_batch_size=1024, max_wait=0.002, stats=None):
+        self.artifact = artifact
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = stats or ServerStats()
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self.worker.start()
+
+    def submit(self, records):
+        """
+        Queues actor records for prediction.
+
+        Args:
+            records (list): Actor records, as dictionaries of feature values.
+
+        Returns:
+            Future: The predictions of the records, as a list of floats.
+        """
+        future = Future()
+        self.requests.put((records, future))
+        return future
+
+    def predict(self, records):
+        X = design_matrix(records_frame(records, self.artifact), self.artifact)
+        predictions = X @ self.artifact['coefficients'] + self.artifact['intercept']
+        if not np.isfinite(predictions).all():
+            raise ValueError('The features give a non-finite prediction.')
+        return predictions
+
+    def close(self):
+        self.requests.put(None)
+        self.worker.join()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._score(batch)
+
+    def _next_batch(self):
+        """
+        Waits for a request, then gathers the requests queued within `max_wait`.
+        """
+        first = self.requests.get()
+        if first is None:
+            return None
+
+        batch, n_actors = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while n_actors < self.max_batch_size:
+            try:
+                request = self.requests.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                # Stop once the batch is scored
+                self.requests.put(None)
+                break
+            batch.append(request)
+            n_actors += len(request[0])
+        return batch
+
+    def _score(self, batch):
+        self.stats.record_batch(len(batch))
+        try:
+            predictions = self.predict([record for records, _ in batch for record in records])
+        except Exception:
+            # Score the requests one by one, so that only the invalid ones fail
+            for records, future in batch:
+                try:
+                    future.set_result(self.predict(records).tolist())
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        bounds = np.cumsum([0] + [len(records) for records, _ in batch])
+        for (_, future), start, end in zip(batch, bounds[:-1], bounds[1:]):
+            future.set_result(predictions[start:end].tolist())
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of a `PredictionServer`.
+    """
+
+    # Keep-alive connections, every response has a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written separately, Nagle's algorithm would delay the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+
+        start = time.perf_counter()
+        records = []
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            records = json.loads(self.rfile.read(length))
+            if isinstance(records, dict):
+                records = [records]
+            if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+                raise ValueError('Expected an actor record or a list of actor records.')
+        except ValueError as e:
+            self._reply(400, {'error': str(e)}, start, len(records) if isinstance(records, list) else 0)
+            return
+
+        if not records:
+            self._reply(200, {'predictions': []}, start, 0)
+            return
+
+        try:
+            predictions = self.server.batcher.submit(records).result(timeout=self.server.timeout_s)
+        except Exception as e:
+            self._reply(400 if isinstance(e, (ValueError, TypeError)) else 500, {'error': str(e)}, start, len(records))
+            return
+        self._reply(200, {'predictions': predictions}, start, len(records))
+
+    def log_message(self, format, *args):
+        # Request logging would dominate the latency under load
+        pass
+
+    def _reply(self, status, body, start, n_actors):
+        self._send_json(status, body)
+        self.server.stats.record_request(n_actors, time.perf_counter() - start, error=status != 200)
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    """
+    HTTP server of the predictions of a saved regression, see the module docstring.
+
+    Args:
+        address (tuple): Host and port. Port 0 picks a free port.
+        artifact_path (str, optional): Path of the saved model. Defaults to `MODEL_PATH`.
+        max_batch_size (int): Maximum number of actors scored together. Default is 1024.
+        max_wait (float): Time in seconds a batch waits for more requests. Default is 0.002.
+        timeout_s (float): Time in seconds a request waits for its predictions. Default is 30.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, artifact_path=MODEL_PATH, max_batch_size=1024, max_wait=0.002, timeout_s=30):
+        self.stats = ServerStats()
+        self.batcher = MicroBatcher(load_regression_artifact(artifact_path), max_batch_size, max_wait, self.stats)
+        self.timeout_s = timeout_s
+        super().__init__(address, PredictionHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the predictions of the actor success regression.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--artifact', default=MODEL_PATH, help='Model saved by train_linear_regression.')
+    parser.add_argument('--max-batch-size', type=int, default=1024)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = PredictionServer((args.host, args.port), args.artifact, args.max_batch_size, args.max_wait_ms / 1000)
+    print(f'Serving predictions on http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .incremental_regression import solve_least_squares
+from .linear_regression import regression_data
+
+# Metrics of each fold or replicate, coefficient confidence intervals and the fit on all the rows
+ResamplingResults = namedtuple('ResamplingResults', ['cv_metrics', 'bootstrap_metrics', 'coefficients'])
+
+# Rows of the design matrix densified at once when it is written
+CHUNK_ROWS = 65536
+
+
+def weighted_statistics(X, y, weights):
+    """
+    Returns the sufficient statistics of a regression with weighted rows, see `solve_least_squares`.
+    """
+    weighted_X = X * weights[:, None]
+    return weights.sum(), weights @ X, weights @ y, weighted_X.T @ X, weighted_X.T @ y
+
+
+def regression_metrics(y_true, y_pred):
+    """
+    Returns the mean squared error and the R² of predictions.
+    """
+    squared_errors = np.sum((y_true - y_pred) ** 2)
+    return squared_errors / len(y_true), 1 - squared_errors / np.sum((y_true - y_true.mean()) ** 2)
+
+
+def write_design(path, X, y):
+    """
+    Writes the design matrix as a contiguous 2-D float64 array and the target to
+    memory-mappable .npy files, densifying the sparse matrix by chunks of rows.
+    """
+    design = np.lib.format.open_memmap(os.path.join(path, 'X.npy'), mode='w+', dtype=np.float64, shape=X.shape)
+    for start in range(0, X.shape[0], CHUNK_ROWS):
+        design[start:start + CHUNK_ROWS] = X[start:start + CHUNK_ROWS].toarray()
+    design.flush()
+    del design
+    np.save(os.path.join(path, 'y.npy'), np.asarray(y, dtype=np.float64))
+
+
+def load_design(path):
+    """
+    Returns zero-copy, read-only views of the design matrix and the target written by `write_design`.
+    """
+    return np.load(os.path.join(path, 'X.npy'), mmap_mode='r'), np.load(os.path.join(path, 'y.npy'), mmap_mode='r')
+
+
+def fold_shard(path, folds, fold_ids, rcond):
+    """
+    Fits the regression without each fold of `fold_ids` and evaluates it on the fold.
+
+    The statistics of all the rows are computed once, and those of each fold subtracted from them.
+    """
+    X, y = load_design(path)
+    total = weighted_statistics(X, y, np.ones(len(y)))
+    results = []
+    for fold in fold_ids:
+        held_out = folds == fold
+        fold_statistics = weighted_statistics(X[held_out], y[held_out], np.ones(held_out.sum()))
+        coefficients, intercept = solve_least_squares(
+            *[all_rows - fold_rows for all_rows, fold_rows in zip(total, fold_statistics)], rcond)
+        results.append(regression_metrics(y[held_out], X[held_out] @ coefficients + intercept))
+    return results
+
+
+def bootstrap_shard(path, seeds, rcond):
+    """
+    Fits the regression on a bootstrap sample for each seed and evaluates it on
+    the out-of-bag rows.
+
+    Returns:
+        np.ndarray: The coefficients and intercept of each replicate.
+        list: The out-of-bag MSE and R² of each replicate.
+    """
+    X, y = load_design(path)
+    n_rows = len(y)
+    fits = np.empty((len(seeds), X.shape[1] + 1))
+    metrics = []
+    for i, seed in enumerate(seeds):
+        sample = np.random.default_rng(seed).integers(0, n_rows, n_rows)
+        weights = np.bincount(sample, minlength=n_rows).astype(np.float64)
+        coefficients, intercept = solve_least_squares(*weighted_statistics(X, y, weights), rcond)
+        fits[i, :-1], fits[i, -1] = coefficients, intercept
+
+        out_of_bag = weights == 0
+        metrics.append(regression_metrics(y[out_of_bag], X[out_of_bag] @ coefficients + intercept))
+    return fits, metrics
+
+
+def resample_regression(df=None, n_folds=5, n_replicates=1000, n_jobs=1, seed=42, confidence=0.95, rcond=1e-10):
+    """
+    Evaluates the success regression with k-fold cross-validation and bootstrap replicates.
+
+    The design matrix is encoded once and written to a memory-mapped float64
+    array that the worker processes map, so folds and replicates don't re-encode
+    or copy the data. Each fit is solved from the sufficient statistics of its rows
+    (see `solve_least_squares`): a fold subtracts its statistics from those of
+    all the rows, a replicate weights the rows by their bootstrap counts. The
+    replicates are seeded independently, so the results don't depend on `n_jobs`.
+
+    Args:
+        df (pd.DataFrame, optional): Actor data. Defaults to `load_actor_data_for_analysis()`.
+        n_folds (int): Number of cross-validation folds. Default is 5.
+        n_replicates (int): Number of bootstrap replicates. Default is 1000.
+        n_jobs (int): Number of worker processes. Default is 1 (no worker process).
+        seed (int): Seed of the folds and of the bootstrap samples. Default is 42.
+        confidence (float): Level of the coefficient confidence intervals. Default is 0.95.
+
+    Returns:
+        ResamplingResults: The 'MSE' and 'R^2' of each fold ('cv_metrics') and the
+            out-of-bag 'MSE' and 'R^2' of each replicate ('bootstrap_metrics'), and the
+            coefficients fitted on all the rows with their bootstrap percentile
+            confidence intervals ('coefficients', indexed by feature and 'Intercept').
+    """
+    data = regression_data(df)
+    features = list(data.features)
+    n_rows = data.X.shape[0]
+
+    rng = np.random.default_rng(seed)
+    folds = rng.permutation(n_rows) % n_folds
+    seeds = np.random.SeedSequence(seed).spawn(n_replicates)
+
+    with tempfile.TemporaryDirectory() as path:
+        write_design(path, data.X, data.y)
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                fold_results = executor.map(fold_shard, [path] * n_jobs, [folds] * n_jobs,
+                                            np.array_split(np.arange(n_folds), n_jobs), [rcond] * n_jobs)
+                bootstrap_results = executor.map(bootstrap_shard, [path] * n_jobs,
+                                                 np.array_split(np.array(seeds, dtype=object), n_jobs), [rcond] * n_jobs)
+                fold_metrics = [metrics for shard in fold_results for metrics in shard]
+                bootstrap_results = list(bootstrap_results)
+        else:
+            fold_metrics = fold_shard(path, folds, np.arange(n_folds), rcond)
+            bootstrap_results = [bootstrap_shard(path, seeds, rcond)]
+
+        X_all, y_all = load_design(path)
+        full_fit = solve_least_squares(*weighted_statistics(X_all, y_all, np.ones(len(y_all))), rcond)
+
+    fits = np.vstack([shard_fits for shard_fits, _ in bootstrap_results])
+    bootstrap_metrics = [metrics for _, shard_metrics in bootstrap_results for metrics in shard_metrics]
+
+    alpha = 1 - confidence
+    lower, upper = np.quantile(fits, [alpha / 2, 1 - alpha / 2], axis=0)
+    coefficients = pd.DataFrame({
+        'Coefficient': np.append(full_fit[0], full_fit[1]),
+        'Lower': lower,
+        'Upper': upper,
+        'Std': fits.std(axis=0, ddof=1)
+    }, index=pd.Index(features + ['Intercept'], name='Feature'))
+
+    return ResamplingResults(
+        pd.DataFrame(fold_metrics, columns=['MSE', 'R^2']).rename_axis('Fold'),
+        pd.DataFrame(bootstrap_metrics, columns=['MSE', 'R^2']).rename_axis('Replicate'),
+        coefficients
+    )
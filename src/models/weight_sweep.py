@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+
+from .movie_success_model import PROFITABILITY_WEIGHT, REVENUE_WEIGHT, REVIEW_WEIGHT, OSCAR_WEIGHT
+from .movie_success_model import log_nominations, movie_input_arrays, scale_to_10
+from .actor_success_model import segment_score_states
+
+# Order of the weights in a weight configuration
+WEIGHT_COLUMNS = ['Profitability weight', 'Revenue weight', 'Review weight', 'Oscar weight']
+BASELINE_WEIGHTS = np.array([PROFITABILITY_WEIGHT, REVENUE_WEIGHT, REVIEW_WEIGHT, OSCAR_WEIGHT])
+
+
+def sweep_success_index(df, weights):
+    """
+    Calculates the 'Movie Success Index' of every movie under many weight configurations at once.
+
+    The profitability, revenue and nomination factors don't depend on the weights
+    and are computed once; their weighted combination is broadcast over the
+    configurations. A configuration equal to the default weights gives exactly
+    the index of `movie_success_index`.
+
+    Args:
+        df (pd.DataFrame): Movie data with the revenue, budget, review score and number of nominations.
+        weights (array-like): Weight configurations of shape (n_configs, 4), with the
+            profitability, revenue, review and Oscar weights (see `WEIGHT_COLUMNS`).
+
+    Returns:
+        np.ndarray: The success index of shape (n_movies, n_configs).
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    revenue, budget, review, nominations = movie_input_arrays(df)
+
+    profitability_score = np.log(np.divide(revenue, budget))
+    scale_to_10(profitability_score, out=profitability_score)
+    revenue_score = np.log10(revenue + 1)
+    scale_to_10(revenue_score, out=revenue_score)
+    nomination_factor = log_nominations(nominations, out=np.empty(len(nominations)))
+
+    profitability_weight, revenue_weight, review_weight, oscar_weight = weights.T
+    oscar_factor = nomination_factor[:, None] * (oscar_weight / np.log(np.nanmax(nominations) + 1))
+    oscar_factor += 1
+
+    max_possible_score = (
+        10 * profitability_weight +
+        10 * revenue_weight +
+        10 * review_weight
+    ) * np.nanmax(oscar_factor, axis=0)
+
+    success_index = profitability_score[:, None] * profitability_weight
+    success_index += revenue_score[:, None] * revenue_weight
+    success_index += review[:, None] * review_weight
+    success_index *= oscar_factor
+    success_index /= max_possible_score
+    success_index *= 10
+    return success_index
+
+
+def dense_ranks(values):
+    """
+    Ranks the values of each column from 0, equal values sharing the same rank.
+    """
+    order = np.argsort(values, axis=0, kind='stable')
+    sorted_values = np.take_along_axis(values, order, axis=0)
+    new_value = np.ones(values.shape, dtype=np.int64)
+    new_value[0] = 0
+    new_value[1:] = sorted_values[1:] != sorted_values[:-1]
+
+    ranks = np.empty(values.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.cumsum(new_value, axis=0), axis=0)
+    return ranks
+
+
+def tied_pairs(sorted_rows):
+    """
+    Counts the pairs of equal values in each row of an array sorted along its rows.
+    """
+    n_rows, n_values = sorted_rows.shape
+    new_run = np.ones(sorted_rows.shape, dtype=bool)
+    new_run[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.append(run_starts, new_run.size))
+    return np.bincount(run_starts // n_values, weights=run_lengths * (run_lengths - 1) // 2, minlength=n_rows)
+
+
+def count_inversions(rows):
+    """
+    Counts the pairs i < j with rows[i] > rows[j] in each row of an array of ranks.
+
+    Runs a bottom-up merge sort on all rows at once. At each level, the sorted
+    halves of every block are merged with a stable sort, which places a value of
+    the right half after all the values of the left half lower or equal to it:
+    its shift in the merged block counts the values of the left half greater than it.
+
+    Args:
+        rows (np.ndarray): Ranks between 0 and n_values - 1, of shape (n_rows, n_values).
+
+    Returns:
+        np.ndarray: The number of inversions of each row.
+    """
+    n_rows, n_values = rows.shape
+    size = 1 << max(n_values - 1, 0).bit_length()
+
+    # Padding with a rank above all others adds no inversion
+    blocks = np.full((n_rows, size), n_values, dtype=np.int64)
+    blocks[:, :n_values] = rows
+    inversions = np.zeros(n_rows, dtype=np.int64)
+
+    width = 1
+    while width < size:
+        blocks = blocks.reshape(n_rows, -1, 2 * width)
+        # Timsort merges the two sorted halves in linear time
+        order = np.argsort(blocks, axis=-1, kind='stable')
+
+        # A value of the right half moves left by the number of greater values of the left half
+        from_right = order >= width
+        shift = order - np.arange(2 * width)
+        inversions += np.where(from_right, shift, 0).sum(axis=(1, 2))
+
+        blocks = np.take_along_axis(blocks, order, axis=-1).reshape(n_rows, size)
+        width *= 2
+
+    return inversions
+
+
+def kendall_tau(baseline, scores):
+    """
+    Calculates Kendall's tau-b between a baseline scoring and each column of `scores`.
+
+    Uses Knight's algorithm: the movies are sorted by baseline then by score, so
+    that discordant pairs are the inversions of the sorted scores. Inversions are
+    counted for all columns at once (see `count_inversions`), in O(n log² n) per
+    column instead of comparing the O(n²) pairs.
+
+    Args:
+        baseline (np.ndarray): Baseline scores, of shape (n,).
+        scores (np.ndarray): Scores to compare, of shape (n, n_configs).
+
+    Returns:
+        np.ndarray: The tau-b of each column, between -1 and 1.
+    """
+    valid = ~np.isnan(baseline)
+    baseline_ranks = dense_ranks(baseline[valid, None])
+    score_ranks = dense_ranks(scores[valid])
+    n_values = len(baseline_ranks)
+
+    # Sort each column by baseline rank, then by rank
+    keys = baseline_ranks * n_values + score_ranks
+    order = np.argsort(keys, axis=0, kind='stable')
+    sorted_keys = np.take_along_axis(keys, order, axis=0).T
+    sorted_ranks = np.take_along_axis(score_ranks, order, axis=0).T
+
+    total_pairs = n_values * (n_values - 1) // 2
+    baseline_ties = tied_pairs(np.sort(baseline_ranks, axis=0).T)
+    score_ties = tied_pairs(np.sort(score_ranks, axis=0).T)
+    joint_ties = tied_pairs(sorted_keys)
+    discordant = count_inversions(sorted_ranks)
+
+    concordant_minus_discordant = total_pairs - baseline_ties - score_ties + joint_ties - 2 * discordant
+    return concordant_minus_discordant / np.sqrt((total_pairs - baseline_ties) * (total_pairs - score_ties))
+
+
+def top_k_overlap(baseline, scores, k=10):
+    """
+    Calculates the share of the k best movies of the baseline that are among the
+    k best movies of each column of `scores`.
+
+    Args:
+        baseline (np.ndarray): Baseline scores, of shape (n,).
+        scores (np.ndarray): Scores to compare, of shape (n, n_configs).
+        k (int): Number of best movies. Default is 10.
+
+    Returns:
+        np.ndarray: The overlap of each column, between 0 and 1.
+    """
+    valid = ~np.isnan(baseline)
+    baseline, scores = baseline[valid], scores[valid]
+    k = min(k, len(baseline))
+
+    in_baseline_top = np.zeros(len(baseline), dtype=bool)
+    in_baseline_top[np.argpartition(-baseline, k - 1)[:k]] = True
+    top = np.argpartition(-scores, k - 1, axis=0)[:k]
+    return in_baseline_top[top].sum(axis=0) / k
+
+
+def rank_stability(baseline, scores, k=10):
+    """
+    Compares the ranking of each column of `scores` with the baseline ranking.
+
+    Returns:
+        pd.DataFrame: The 'Kendall tau' and 'Top-k overlap' of each column.
+    """
+    return pd.DataFrame({
+        'Kendall tau': kendall_tau(baseline, scores),
+        f'Top-{k} overlap': top_k_overlap(baseline, scores, k)
+    })
+
+
+def weight_sweep(df, weights, k=10):
+    """
+    Scores the movies under each weight configuration and compares the rankings
+    with the ranking under the default weights.
+
+    Args:
+        df (pd.DataFrame): Movie data with the revenue, budget, review score and number of nominations.
+        weights (array-like): Weight configurations of shape (n_configs, 4), see `WEIGHT_COLUMNS`.
+        k (int): Number of best movies for the top-k overlap. Default is 10.
+
+    Returns:
+        np.ndarray: The success index of shape (n_movies, n_configs).
+        pd.DataFrame: The weights, 'Kendall tau' and 'Top-k overlap' of each configuration.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    scores = sweep_success_index(df, weights)
+    baseline = sweep_success_index(df, BASELINE_WEIGHTS)[:, 0]
+
+    stats = pd.DataFrame(weights, columns=WEIGHT_COLUMNS).join(rank_stability(baseline, scores, k))
+    return scores, stats
+
+
+def sweep_actor_scores(character_movie_df, movie_df, scores, mul_factor=0.15, penalty_threshold=-0.25):
+    """
+    Calculates the 'Actor Score Index' of every actor under each weight configuration,
+    like `actor_success_index` with the movies scored by each column of `scores`.
+
+    Args:
+        character_movie_df (pd.DataFrame): Actor-movie data, as returned by `actor_data`.
+        movie_df (pd.DataFrame): The movies scored in `scores`, with their 'Freebase movie ID'.
+        scores (np.ndarray): Success index of the movies, as returned by `sweep_success_index`.
+
+    Returns:
+        pd.DataFrame: The score index of shape (n_actors, n_configs), indexed by actor name.
+    """
+    rows = character_movie_df.dropna(subset=['Actor name']).sort_values(by=['Actor name', 'Movie release date_x'])
+    movies = pd.Index(movie_df['Freebase movie ID']).get_indexer(rows['Freebase movie ID'])
+    if (movies < 0).any():
+        raise KeyError("Some movies of the actors are not in 'movie_df'.")
+
+    actor_names = rows['Actor name'].to_numpy()
+    starts = np.flatnonzero(np.append(True, actor_names[1:] != actor_names[:-1]))
+
+    # Boost the score of the movies where the actor has the lead role
+    movie_scores = scores[movies]
+    lead_role = (rows['Movie star'].to_numpy() == actor_names)[:, None]
+    movie_scores = np.where(lead_role, 1.25 * movie_scores, movie_scores)
+
+    _, score_sums = segment_score_states(movie_scores, starts, mul_factor, penalty_threshold)
+    lengths = np.diff(np.append(starts, len(actor_names)))
+    cumulative_scores = np.log(score_sums / lengths[:, None])
+
+    low, high = np.nanmin(cumulative_scores, axis=0), np.nanmax(cumulative_scores, axis=0)
+    score_index = 10 * (cumulative_scores - low) / (high - low)
+    return pd.DataFrame(score_index, index=pd.Index(actor_names[starts], name='Actor name'))
@@ -0,0 +1,263 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from src.data import raw_data, clean_data, actor_data, scrape_actor_data, clean_actor_data
+from src.data import actor_data_completion, data_loader, freebase_fields, join_keys, transform_data
+from src.data.data_loader import OSCARS_PATH, MOVIE_STATS_PATH, MOVIE_METADATA_PATH, CHARACTER_METADATA_PATH
+from src.engines import ActorScraperEngine, EntityConverterEngine, UniversityMatchEngine, spider
+from src.models import movie_success_index, actor_success_index
+from src.models import actor_success_model, movie_success_model
+
+PIPELINE_CACHE_DIR = 'data/pipeline_cache'
+
+
+class Stage:
+    """
+    A step of the pipeline: a function applied to the outputs of other stages.
+    """
+
+    def __init__(self, name, func, inputs=(), files=(), params=None, version=1, code=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.files = list(files)
+        self.params = params or {}
+        self.version = version
+        # Functions, classes or modules whose source is part of the fingerprint
+        self.code = code or [func]
+
+    def code_hash(self):
+        """
+        Hashes the source of the stage code.
+        """
+        digest = hashlib.sha256()
+        for obj in self.code:
+            digest.update(inspect.getsource(obj).encode())
+        return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    Runs a DAG of stages, storing each stage output on disk.
+
+    A stage is fingerprinted by its code, version and parameters, the content
+    hash of its input stages' outputs and the content of its input files. A
+    stage is only re-run when its fingerprint changes, and stored outputs are
+    only loaded when a stage that has to run needs them.
+    """
+
+    def __init__(self, cache_dir=PIPELINE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.stages = {}
+        self._file_hashes = {}
+
+    def stage(self, name, func, inputs=(), files=(), params=None, version=1, code=None):
+        """
+        Registers a stage. `func` is called with the outputs of `inputs` as
+        positional arguments and `params` as keyword arguments.
+        """
+        for input_name in inputs:
+            if input_name not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{input_name}'.")
+        self.stages[name] = Stage(name, func, inputs, files, params, version, code)
+        return self
+
+    def run(self, target=None, force=()):
+        """
+        Runs the stages needed to produce `target` (by default the last registered
+        stage), re-running only those whose fingerprint changed.
+
+        Args:
+            target (str, optional): Name of the stage to produce.
+            force (iterable, optional): Names of stages to re-run regardless of their fingerprint.
+
+        Returns:
+            The output of the target stage.
+        """
+        target = target or list(self.stages)[-1]
+        outputs = {}
+        content_hashes = {}
+        paths = {}
+
+        for name in self._upstream(target):
+            stage = self.stages[name]
+            fingerprint = self.fingerprint(stage, content_hashes)
+            path = os.path.join(self.cache_dir, f'{name}-{fingerprint[:16]}')
+            paths[name] = path
+
+            if name not in force and os.path.exists(path + '.json'):
+                with open(path + '.json') as f:
+                    content_hashes[name] = json.load(f)['content_hash']
+                print(f"[{name}] up to date")
+                continue
+
+            print(f"[{name}] running...")
+            args = [self._output(input_name, outputs, paths) for input_name in stage.inputs]
+            outputs[name] = stage.func(*args, **stage.params)
+            content_hashes[name] = content_hash(outputs[name])
+            self._store(name, path, outputs[name], content_hashes[name])
+
+        return self._output(target, outputs, paths)
+
+    def fingerprint(self, stage, content_hashes):
+        """
+        Fingerprints a stage from its code, version, parameters, inputs and files.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'name': stage.name,
+            'version': stage.version,
+            'params': repr(sorted(stage.params.items())),
+            'code': stage.code_hash(),
+            'inputs': [content_hashes[input_name] for input_name in stage.inputs],
+            'files': [self.file_hash(path) for path in stage.files]
+        }).encode())
+        return digest.hexdigest()
+
+    def file_hash(self, path):
+        """
+        Hashes the content of a file, reusing the hash while its size and mtime don't change.
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._file_hashes:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self._file_hashes[key] = digest.hexdigest()
+        return self._file_hashes[key]
+
+    def _upstream(self, target):
+        """
+        Returns the stages needed for `target`, in topological order.
+        """
+        order = []
+
+        def visit(name):
+            if name in order:
+                return
+            for input_name in self.stages[name].inputs:
+                visit(input_name)
+            order.append(name)
+
+        visit(target)
+        return order
+
+    def _output(self, name, outputs, paths):
+        """
+        Returns the output of a stage, loading it from disk if it was not run.
+        """
+        if name not in outputs:
+            with open(paths[name] + '.pkl', 'rb') as f:
+                outputs[name] = pickle.load(f)
+        return outputs[name]
+
+    def _store(self, name, path, output, output_hash):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(path + '.pkl', 'wb') as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path + '.json', 'w') as f:
+            json.dump({'stage': name, 'content_hash': output_hash}, f)
+
+
+def content_hash(output):
+    """
+    Hashes the content of a stage output. DataFrames are hashed column by column
+    with pandas' hashing, anything else through its pickled bytes.
+    """
+    digest = hashlib.sha256()
+    if isinstance(output, pd.DataFrame):
+        digest.update(repr((list(output.columns), list(output.dtypes.astype(str)))).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(output, index=True).to_numpy().tobytes())
+            return digest.hexdigest()
+        except TypeError:
+            pass
+    digest.update(pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def scored_movies(clean_df):
+    """
+    Returns a copy of the cleaned movies with their success index.
+    """
+    movie_df = clean_df.copy()
+    movie_success_index(movie_df)
+    return movie_df
+
+
+def scored_actors(character_movie_df):
+    """
+    Returns the actors with their success index, without sorting the input in place.
+    """
+    return actor_success_index(character_movie_df.copy())
+
+
+def actor_profiles(actor_df):
+    """
+    Returns the actors without their success index, sorted by name, so that
+    the output doesn't change when only the scores change.
+    """
+    return actor_df.drop(columns='Actor Score Index').sort_index()
+
+
+def scraped_actors(actor_df):
+    """
+    Returns a copy of the actors with height information, completed with their scraped Wikipedia data.
+    """
+    actor_df = actor_df.dropna(subset='Actor height').copy()
+    scrape_actor_data(actor_df)
+    return actor_df
+
+
+def cleaned_actors(actor_df):
+    """
+    Returns a cleaned copy of the scraped actor data.
+    """
+    actor_df = actor_df.copy()
+    clean_actor_data(actor_df)
+    return actor_df
+
+
+def actors_for_analysis(actor_df, scored_actor_df):
+    """
+    Adds the actors' success index to the cleaned actor data, as 'Success Score'.
+    """
+    # The scraper renames the actors with capitalized names
+    scores = scored_actor_df['Actor Score Index'].rename(index=spider.cap_surnames)
+    return actor_df.join(scores.rename('Success Score'))
+
+
+def actor_pipeline(cache_dir=PIPELINE_CACHE_DIR):
+    """
+    Builds the pipeline of the notebook, from the raw datasets to the cleaned actor data.
+
+    The scraping and the cleaning of the actor data only depend on the actor
+    profiles, so changing how movies or actors are scored only re-runs the
+    scoring stages and the final join.
+
+    Returns:
+        Pipeline: The pipeline, with stages 'raw', 'clean', 'movies', 'actor_movies',
+            'actors', 'actor_profiles', 'scraped_actors', 'clean_actors' and 'actor_analysis'.
+    """
+    pipeline = Pipeline(cache_dir)
+    pipeline.stage('raw', raw_data, files=[OSCARS_PATH, MOVIE_STATS_PATH, MOVIE_METADATA_PATH],
+                   code=[raw_data, transform_data.merge_data, data_loader, freebase_fields, join_keys])
+    pipeline.stage('clean', clean_data, inputs=['raw'])
+    pipeline.stage('movies', scored_movies, inputs=['clean'], code=[scored_movies, movie_success_model])
+    pipeline.stage('actor_movies', actor_data, inputs=['movies'], files=[CHARACTER_METADATA_PATH],
+                   code=[actor_data, data_loader])
+    pipeline.stage('actors', scored_actors, inputs=['actor_movies'], code=[scored_actors, actor_success_model])
+    pipeline.stage('actor_profiles', actor_profiles, inputs=['actors'])
+    pipeline.stage('scraped_actors', scraped_actors, inputs=['actor_profiles'],
+                   code=[scraped_actors, scrape_actor_data, ActorScraperEngine])
+    pipeline.stage('clean_actors', cleaned_actors, inputs=['scraped_actors'],
+                   code=[cleaned_actors, actor_data_completion, EntityConverterEngine, UniversityMatchEngine])
+    pipeline.stage('actor_analysis', actors_for_analysis, inputs=['clean_actors', 'actors'])
+    return pipeline
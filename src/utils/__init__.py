@@ -1,2 +1,3 @@
 import matplotlib.pyplot as plt
-from .plot_graphs import *
\ No newline at end of file
+from .plot_graphs import *
+from .ranking import top_k, bottom_k, Leaderboard
@@ -4,11 +4,31 @@ import plotly.io as pio
 import seaborn as sns
 import pandas as pd
 from plotly.subplots import make_subplots
+from src.models.movie_success_model import BOUNDS_ATTR, INTERMEDIATE_COLUMNS, success_index_components
+from .ranking import top_k, bottom_k
+
+TOP5_COLUMNS = ['Movie name', 'Movie release date', 'Movie Success Index', 'Review score', 'Revenue score', 'Profitability score']
+
+
+def with_success_components(df):
+    '''Adds the intermediate columns of the Movie Success Index, if they were not kept by `movie_success_index`.
+    They are normalized like in the full scored DataFrame, even if `df` is a filtered view of it.'''
+    missing = [column for column in INTERMEDIATE_COLUMNS if column not in df.columns]
+    if not missing:
+        return df
+    if 'Movie Success Index' in df.columns and BOUNDS_ATTR not in df.attrs:
+        raise ValueError('The normalization bounds of the Movie Success Index are missing: '
+                         'score the movies with movie_success_index(df, keep_intermediate=True).')
+    components = success_index_components(df)
+    return df.assign(**{column: components[column].to_numpy() for column in missing})
 
 
 def hist_std_config(df, column_name):
     '''Easy plotting of different histograms with KDE for different columns of a DataFrame'''
     
+    if column_name in INTERMEDIATE_COLUMNS:
+        df = with_success_components(df)
+
     color_palette = ['#FAD0C9', '#F8A5B1', '#FDCB82', '#E17055', '#D35400', '#F39C12', '#F1C40F']
     
     sns.set_palette("muted")  
@@ -46,6 +66,9 @@ def hist_std_config_ax(df, column_name, ax):
     '''Easy plotting of different histograms with KDE for different columns of a DataFrame'''
     color_palette = ['#FAD0C9', '#F8A5B1', '#FDCB82', '#E17055', '#D35400', '#F39C12', '#F1C40F']
     
+    if column_name in INTERMEDIATE_COLUMNS:
+        df = with_success_components(df)
+
     sns.set_palette("muted")
     
     ax.hist(df[column_name], bins=50, edgecolor='gray', alpha=0.6, density=True, color=color_palette[2])
@@ -96,19 +119,20 @@ def bar_plot_available_data(df):
 
 
 
-def top5_best(df): 
-    return df.sort_values(by='Movie Success Index', ascending=False).head(5)[['Movie name','Movie release date', 'Movie Success Index', 'Review score', 'Revenue score', 'Profitability score']]
+def top5_best(df, by=None):
+    # Rank the rows as given, then add the components of the selected movies only
+    return with_success_components(top_k(df, 'Movie Success Index', 5, by=by))[TOP5_COLUMNS]
 
 
-def top5_worst(df): 
-    return df.sort_values(by='Movie Success Index', ascending=True).head(5)[['Movie name','Movie release date', 'Movie Success Index', 'Review score', 'Revenue score', 'Profitability score']]
+def top5_worst(df, by=None):
+    return with_success_components(bottom_k(df, 'Movie Success Index', 5, by=by))[TOP5_COLUMNS]
 
 
 def oscar_pie_chart(df):
     color_palette = ['#FAD0C9', '#F8A5B1', '#FDCB82', '#E17055', '#D35400', '#F39C12', '#F1C40F', 
                      '#FAB1A0', '#FF7675', '#FDCB6E', '#E74C3C', '#D98880', '#E59866', '#FFC300']
 
-    nomination_count = df['Number of nomination'].astype(int).value_counts()
+    nomination_count = df['Number of nomination'].fillna(0).astype(int).value_counts()
 
     # Calculate values for the first pie chart
     no_nomination_count = nomination_count.get(0, 0)
@@ -229,6 +253,7 @@ def profitability_histograms(data, revenue_budget_max=200, log_revenue_budget_ma
         None
     """
 
+    data = with_success_components(data)
     fig = make_subplots(
         rows=2, cols=1,
         shared_xaxes=False,
@@ -295,6 +320,8 @@ def movie_revenue_distribution_plot(data, revenue_max=500_000_000, log_revenue_m
     Returns:
         None
     """
+    data = with_success_components(data)
+
     # Create subplots
     fig = make_subplots(
         rows=2, cols=1,
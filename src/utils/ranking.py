@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+
+def top_k_positions(values, k, largest=True):
+    """
+    Finds the positions of the k largest (or smallest) values without sorting all of them.
+
+    `np.partition` selects the k-th value in O(n), and only the values up to
+    it are sorted. Ties are ordered by position and missing values come last,
+    as with a stable `sort_values`.
+
+    Args:
+        values (array-like): The scores.
+        k (int): Number of positions.
+        largest (bool): Whether to return the largest values (True) or the smallest. Default is True.
+
+    Returns:
+        np.ndarray: The positions of the k best values, best first.
+    """
+    keys = np.asarray(values, dtype=np.float64)
+    keys = -keys if largest else keys
+    k = min(k, len(keys))
+    valid = np.flatnonzero(~np.isnan(keys))
+
+    candidates = valid
+    if 0 < k < len(valid):
+        kth = np.partition(keys[valid], k - 1)[k - 1]
+        # All the values tied with the k-th one, so that ties are ordered by position
+        candidates = valid[keys[valid] <= kth]
+    top = candidates[np.lexsort((candidates, keys[candidates]))][:k]
+
+    if len(top) < k:
+        top = np.append(top, np.flatnonzero(np.isnan(keys))[:k - len(top)])
+    return top
+
+
+def sorted_positions(values, largest=True):
+    """
+    Returns the positions of all the values, best first, ties by position and missing values last.
+    """
+    keys = np.asarray(values, dtype=np.float64)
+    keys = -keys if largest else keys
+    # Stable sorts keep the positions of ties in order and put NaN last
+    return np.argsort(keys, kind='stable')
+
+
+def group_codes(df, by):
+    """
+    Returns the group of each row in sorted group order, -1 for the rows with missing keys.
+    """
+    return df.groupby(by, sort=True).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+
+
+def group_top_k(order, codes, k):
+    """
+    Keeps the k first positions of each group in a ranking.
+
+    Args:
+        order (np.ndarray): Positions of the rows, best first.
+        codes (np.ndarray): Group of each row, -1 for rows without group.
+        k (int): Number of rows per group.
+
+    Returns:
+        np.ndarray: The positions of the k best rows of each group, by group then rank.
+    """
+    ranked_codes = codes[order]
+    order, ranked_codes = order[ranked_codes >= 0], ranked_codes[ranked_codes >= 0]
+    # Rank of each row within its group, then only the kept rows are sorted by group
+    ranks = pd.Series(ranked_codes).groupby(ranked_codes).cumcount().to_numpy()
+    kept = ranks < k
+    return order[kept][np.argsort(ranked_codes[kept], kind='stable')]
+
+
+def top_k(df, column, k=5, largest=True, by=None):
+    """
+    Returns the k rows with the highest (or lowest) score, like
+    `df.sort_values(column, ascending=not largest).head(k)` without the full sort.
+
+    Args:
+        df (pd.DataFrame): The rows to rank.
+        column (str): Name of the score column.
+        k (int): Number of rows, per group if `by` is given. Default is 5.
+        largest (bool): Whether to return the highest scores (True) or the lowest. Default is True.
+        by (str or list, optional): Columns of the groups. The k best rows of each group
+            are returned, groups in sorted order. Rows with missing keys are dropped.
+
+    Returns:
+        pd.DataFrame: The rows, best first.
+    """
+    if by is None:
+        return df.iloc[top_k_positions(df[column].to_numpy(), k, largest)]
+
+    return df.iloc[group_top_k(sorted_positions(df[column].to_numpy(), largest), group_codes(df, by), k)]
+
+
+def bottom_k(df, column, k=5, by=None):
+    """
+    Returns the k rows with the lowest score, see `top_k`.
+    """
+    return top_k(df, column, k, largest=False, by=by)
+
+
+class Leaderboard:
+    """
+    Repeated top-k queries on the score columns of a DataFrame.
+
+    The ranking of each score column is sorted once, on the first query that
+    needs it, and cached: later top-k queries slice it in O(k), and top-k per
+    group take O(n). A single top-k query with no cached ranking uses
+    `top_k_positions` instead of sorting. Scores must be changed through
+    `update_scores`, or the cache cleared with `invalidate`, after the frame is
+    modified.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        # Cached rankings by (column, largest)
+        self._orders = {}
+
+    def ranking(self, column, largest=True):
+        """
+        Returns the cached positions of the rows sorted by score, best first.
+        """
+        key = (column, largest)
+        if key not in self._orders:
+            self._orders[key] = sorted_positions(self.df[column].to_numpy(), largest)
+        return self._orders[key]
+
+    def top(self, column, k=5, largest=True, by=None):
+        """
+        Returns the k rows with the highest (or lowest) score, see `top_k`.
+        """
+        if by is not None:
+            return self.df.iloc[group_top_k(self.ranking(column, largest), group_codes(self.df, by), k)]
+
+        if (column, largest) in self._orders:
+            return self.df.iloc[self._orders[(column, largest)][:k]]
+        return self.df.iloc[top_k_positions(self.df[column].to_numpy(), k, largest)]
+
+    def bottom(self, column, k=5, by=None):
+        return self.top(column, k, largest=False, by=by)
+
+    def update_scores(self, column, values):
+        """
+        Sets the values of a score column and invalidates its cached rankings.
+        """
+        self.df[column] = values
+        self.invalidate(column)
+
+    def invalidate(self, column=None):
+        """
+        Clears the cached rankings of a column, or of all columns.
+        """
+        self._orders = {key: order for key, order in self._orders.items() if column is not None and key[0] != column}
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from src.data.column_store import MOVIE_NUMERIC_COLUMNS, NumericColumnStore
+from src.models.movie_success_model import movie_success_index, movie_input_arrays, success_index_arrays
+
+
+def movies(n_movies=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Wikipedia movie ID': rng.permutation(np.arange(1000, 1000 + n_movies)),
+        'Movie name': [f'movie {i}' for i in range(n_movies)],
+        'Movie box office revenue': rng.uniform(1e5, 1e9, n_movies),
+        'Movie budget': rng.uniform(1e5, 2e8, n_movies),
+        'Review score': rng.uniform(1, 10, n_movies),
+        'Movie votes': rng.integers(10, 10_000, n_movies),
+        'Number of nomination': np.where(rng.random(n_movies) < 0.3, rng.integers(1, 12, n_movies), np.nan),
+        'Movie release date': pd.array(rng.integers(1950, 2010, n_movies), dtype='Int64')
+    })
+
+
+def test_write_movies(tmp_path):
+    df = movies()
+    store = NumericColumnStore.write_movies(str(tmp_path), df)
+
+    assert store.columns == MOVIE_NUMERIC_COLUMNS
+    np.testing.assert_array_equal(store.ids, np.sort(df['Wikipedia movie ID']))
+    np.testing.assert_array_equal(store.get('Movie votes', df['Wikipedia movie ID']), df['Movie votes'])
+
+
+def test_success_index_from_store(tmp_path):
+    df = movies()
+    store = NumericColumnStore.write_movies(str(tmp_path), df.drop(columns='Movie votes'))
+    assert 'Movie votes' not in store.columns
+
+    movie_success_index(df)
+    success_index, _ = success_index_arrays(*movie_input_arrays(store))
+    expected = df.set_index('Wikipedia movie ID')['Movie Success Index'].loc[store.ids]
+    np.testing.assert_array_equal(success_index, expected.to_numpy())
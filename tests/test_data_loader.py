@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import convert_release_dates, convert_to_datetime
+
+
+def test_convert_release_dates():
+    dates = pd.Series(['1988', 1999, '2001-05', '2010-07-14', '1500-01-01', 'garbage', np.nan, '1988'], name='date')
+    expected = dates.apply(convert_to_datetime).astype('datetime64[ns]')
+    pd.testing.assert_series_equal(convert_release_dates(dates), expected)
+
+
+def test_convert_missing_release_dates():
+    dates = pd.Series([np.nan, np.nan], index=[3, 5], name='date')
+    expected = pd.Series(pd.NaT, index=dates.index, name='date', dtype='datetime64[ns]')
+    pd.testing.assert_series_equal(convert_release_dates(dates), expected)
+    assert len(convert_release_dates(pd.Series([], dtype=object))) == 0
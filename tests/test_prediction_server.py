@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.data.encoding import CategoricalEncoder
+from src.models.linear_regression import load_regression_artifact, save_regression_artifact
+from src.models.prediction_server import MicroBatcher
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = pd.DataFrame({
+        'Height': rng.uniform(1.5, 2.0, 50),
+        'Birth Year': rng.integers(1940, 2000, 50).astype(np.float64),
+        'Gender': rng.choice(['F', 'M'], 50),
+        'Birth Region': rng.choice(['Europe', 'USA'], 50)
+    })
+    encoder = CategoricalEncoder(['Gender', 'Birth Region']).fit(rows)
+    X = np.column_stack([rows[['Height', 'Birth Year']].to_numpy(), encoder.transform(rows).toarray()])
+    model = LinearRegression().fit(X, rng.uniform(0, 30, 50))
+
+    path = str(tmp_path / 'model.json')
+    save_regression_artifact(model, ['Height', 'Birth Year'] + encoder.feature_names, encoder.categories, path)
+    return load_regression_artifact(path)
+
+
+def score_batch(batcher, requests):
+    """
+    Submits the requests within one micro-batch and returns their futures.
+    """
+    futures = [batcher.submit(records) for records in requests]
+    for future in futures:
+        future.exception(timeout=10)
+    assert batcher.stats.batches == 1
+    return futures
+
+
+def test_mixed_keys(artifact):
+    requests = [
+        [{'Gender': 'F', 'Height': 1.7}],
+        [{'Gender': 'M', 'Height': 1.8, 'Birth Year': 1970, 'Birth Region': 'USA'}],
+        [{'Birth Region': 'Europe', 'Unused': 'value'}, {}]
+    ]
+    batcher = MicroBatcher(artifact, max_wait=1)
+    try:
+        futures = score_batch(batcher, requests)
+    finally:
+        batcher.close()
+
+    alone = MicroBatcher(artifact, max_batch_size=1, max_wait=0)
+    try:
+        for records, future in zip(requests, futures):
+            assert np.isfinite(future.result()).all()
+            np.testing.assert_array_equal(future.result(), alone.submit(records).result(timeout=10))
+    finally:
+        alone.close()
+
+
+def test_non_finite_values(artifact):
+    requests = [
+        [{'Gender': 'F', 'Height': 1.7}],
+        [{'Gender': 'M', 'Height': None}],
+        [{'Height': float('inf')}]
+    ]
+    batcher = MicroBatcher(artifact, max_wait=1)
+    try:
+        valid, missing, infinite = score_batch(batcher, requests)
+    finally:
+        batcher.close()
+
+    assert np.isfinite(valid.result()).all()
+    for future in (missing, infinite):
+        with pytest.raises(ValueError, match='Height'):
+            future.result()
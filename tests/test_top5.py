@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.models.movie_success_model import movie_success_index
+from src.utils.plot_graphs import top5_best, top5_worst
+
+
+def movies(n_movies=40, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Movie name': [f'movie {i}' for i in range(n_movies)],
+        'Movie release date': rng.integers(1950, 2010, n_movies),
+        'Movie box office revenue': rng.uniform(1e5, 1e9, n_movies),
+        'Movie budget': rng.uniform(1e5, 2e8, n_movies),
+        'Review score': rng.uniform(1, 10, n_movies),
+        'Number of nomination': np.where(rng.random(n_movies) < 0.3, rng.integers(1, 12, n_movies), np.nan)
+    })
+    full = df.copy()
+    movie_success_index(full, keep_intermediate=True)
+    movie_success_index(df)
+    return df, full
+
+
+def test_duplicate_index():
+    df, full = movies()
+    # Every label twice, with the scores of the same movies repeated
+    df = pd.concat([df, df])
+    full = pd.concat([full, full])
+
+    for top5, ascending in [(top5_best, False), (top5_worst, True)]:
+        expected = full.sort_values('Movie Success Index', ascending=ascending, kind='stable').head(5)
+        result = top5(df)
+        assert list(result.index) == list(expected.index)
+        pd.testing.assert_frame_equal(result, expected[result.columns])
+
+
+def test_filtered_frame():
+    df, full = movies()
+    decade = df[(df['Movie release date'] >= 1980) & (df['Movie release date'] < 1990)]
+
+    result = top5_best(decade)
+    expected = full.loc[decade.index].sort_values('Movie Success Index', ascending=False, kind='stable').head(5)
+    # The components keep the normalization of the full frame
+    pd.testing.assert_frame_equal(result, expected[result.columns])
+
+
+def test_groups():
+    df, full = movies()
+    df['Decade'] = full['Decade'] = df['Movie release date'] // 10 * 10
+
+    result = top5_best(df, by='Decade')
+    expected = (full.sort_values('Movie Success Index', ascending=False, kind='stable')
+                .groupby('Decade', sort=True).head(5).sort_values('Decade', kind='stable'))
+    pd.testing.assert_frame_equal(result, expected[result.columns])